@@ -0,0 +1,87 @@
+import argparse
+import multiprocessing
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from memoria_compartilhada import TabelaCompartilhada
+from trabalhadores import tabela_anexada
+
+
+# Função para gerar uma tabela de tarefas sintética com as colunas da planilha
+def gerar_tarefas(linhas, semente=0):
+    rng = np.random.default_rng(semente)
+    inicio = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, linhas), unit="D")
+    tecnicos = np.array([f"Técnico {i}" for i in range(60)], dtype=object)
+    return pd.DataFrame({
+        "ID tarefa": np.arange(linhas),
+        "URL tarefa": np.array([f"sistema.exemplo.com/tarefa/{i}" for i in range(linhas)], dtype=object),
+        "Projeto": np.array([f"Projeto {i}" for i in range(200)], dtype=object)[rng.integers(0, 200, linhas)],
+        "Atividade": np.array(["Instalação", "Manutenção", "Vistoria", "Suporte"], dtype=object)[rng.integers(0, 4, linhas)],
+        "Data Início": inicio,
+        "Data Vencimento": inicio + pd.to_timedelta(rng.integers(0, 30, linhas), unit="D"),
+        "Técnico": tecnicos[rng.integers(0, 60, linhas)] + ", " + tecnicos[rng.integers(0, 60, linhas)],
+    })
+
+
+# Trabalho pequeno de propósito: o tempo medido é quase todo de entrega dos dados
+def _resumo(df):
+    return int(df["Projeto"].nunique()), int(df["ID tarefa"].sum())
+
+
+def tarefa_com_pickle(df):
+    return _resumo(df)
+
+
+def tarefa_compartilhada(descritor):
+    return _resumo(tabela_anexada(descritor))
+
+
+def medir(executor, funcao, argumento, tarefas):
+    inicio = time.perf_counter()
+    resultados = [futuro.result() for futuro in [executor.submit(funcao, argumento) for _ in range(tarefas)]]
+    return time.perf_counter() - inicio, resultados[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara a entrega do dataframe por pickle e por memória compartilhada")
+    parser.add_argument("--linhas", type=int, default=200_000)
+    parser.add_argument("--tarefas", type=int, default=8)
+    parser.add_argument("--processos", type=int, default=4)
+    args = parser.parse_args()
+
+    df = gerar_tarefas(args.linhas)
+    print(f"Linhas: {args.linhas} | tarefas: {args.tarefas} | processos: {args.processos}")
+    print(f"Dataframe serializado: {len(pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)) / 1e6:.1f} MB")
+
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=args.processos, mp_context=contexto) as executor:
+        # Aquecer os processos (o tempo de inicialização não entra na comparação)
+        list(executor.map(int, range(args.processos)))
+
+        tempo_pickle, resultado_pickle = medir(executor, tarefa_com_pickle, df, args.tarefas)
+
+        inicio = time.perf_counter()
+        tabela = TabelaCompartilhada(df)
+        tempo_publicacao = time.perf_counter() - inicio
+        try:
+            print(f"Bloco compartilhado: {tabela.tamanho / 1e6:.1f} MB | "
+                  f"descritor serializado: {len(pickle.dumps(tabela.descritor))} bytes")
+            tempo_compartilhado, resultado_compartilhado = medir(executor, tarefa_compartilhada, tabela.descritor, args.tarefas)
+            # Segunda rodada: os processos já têm a tabela anexada
+            tempo_anexada, _ = medir(executor, tarefa_compartilhada, tabela.descritor, args.tarefas)
+        finally:
+            tabela.liberar()
+
+    assert resultado_pickle == resultado_compartilhado
+    print(f"Pickle por tarefa:                 {tempo_pickle:.3f} s")
+    print(f"Memória compartilhada (publicação): {tempo_publicacao:.3f} s")
+    print(f"Memória compartilhada (1ª rodada):  {tempo_compartilhado:.3f} s")
+    print(f"Memória compartilhada (já anexada): {tempo_anexada:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
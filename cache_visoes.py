@@ -0,0 +1,104 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Limite padrão de memória do cache de visões (em MB)
+LIMITE_CACHE_MB = 64
+
+
+# Função para normalizar a descrição de uma visão (pesquisa + filtros)
+# Pesquisas que diferem só em maiúsculas e filtros em outra ordem geram a mesma chave
+# Os espaços do termo são mantidos: a pesquisa procura o texto exatamente como digitado
+def normalizar_descritor(termo="", filtros=None):
+    termo = str(termo or "").lower()
+
+    filtros_normalizados = []
+    for coluna, valores in sorted((filtros or {}).items()):
+        if isinstance(valores, (list, tuple, set, frozenset)):
+            valores = tuple(sorted(str(valor) for valor in valores))
+        else:
+            valores = (str(valores),)
+        filtros_normalizados.append((coluna, valores))
+
+    return (termo, tuple(filtros_normalizados))
+
+
+# Função para estimar quantos bytes um valor armazenado no cache ocupa
+def estimar_tamanho(valor):
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    if isinstance(valor, (pd.Series, pd.DataFrame, pd.Index)):
+        return int(np.sum(valor.memory_usage(deep=True)))
+    if isinstance(valor, dict):
+        return sum(estimar_tamanho(item) for item in valor.values())
+    if isinstance(valor, (list, tuple)):
+        return sum(estimar_tamanho(item) for item in valor)
+    if isinstance(valor, str):
+        return len(valor)
+    return 8
+
+
+# Cache LRU com limite de memória, seguro para uso entre threads
+class CacheVisoes:
+    def __init__(self, limite_mb=LIMITE_CACHE_MB):
+        self.limite_bytes = int(limite_mb * 1024 * 1024)
+        self._itens = OrderedDict()
+        self._bytes_usados = 0
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+
+    def obter(self, chave):
+        with self._trava:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return self._itens[chave][0]
+            self.falhas += 1
+            return None
+
+    def guardar(self, chave, valor):
+        tamanho = estimar_tamanho(valor)
+        with self._trava:
+            if chave in self._itens:
+                self._bytes_usados -= self._itens.pop(chave)[1]
+
+            # Itens maiores que o limite inteiro não são guardados
+            if tamanho > self.limite_bytes:
+                return valor
+
+            self._itens[chave] = (valor, tamanho)
+            self._bytes_usados += tamanho
+
+            # Remover os itens usados há mais tempo até caber no limite
+            while self._bytes_usados > self.limite_bytes:
+                _, (_, tamanho_removido) = self._itens.popitem(last=False)
+                self._bytes_usados -= tamanho_removido
+                self.remocoes += 1
+        return valor
+
+    # Obtém o valor do cache ou calcula e guarda (o cálculo roda fora da trava)
+    def obter_ou_calcular(self, chave, calcular):
+        valor = self.obter(chave)
+        if valor is None:
+            valor = self.guardar(chave, calcular())
+        return valor
+
+    def limpar(self):
+        with self._trava:
+            self._itens.clear()
+            self._bytes_usados = 0
+
+    def estatisticas(self):
+        with self._trava:
+            return {
+                "itens": len(self._itens),
+                "bytes_usados": self._bytes_usados,
+                "limite_bytes": self.limite_bytes,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "remocoes": self.remocoes,
+            }
@@ -0,0 +1,79 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+FORMATO_DATA = "%d/%m/%Y"
+
+COLUNAS_DATA = ["Data Início", "Data Vencimento"]
+
+
+# Função para formatar uma coluna inteira como texto de exibição
+# Datas no formato dd/mm/aaaa, URLs com "https://" e valores ausentes como texto vazio
+# Com prefixar_url=False as URLs ficam como na planilha (usado na pesquisa)
+def formatar_coluna(serie, coluna, prefixar_url=True):
+    ausentes = serie.isna().to_numpy()
+
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        # Poucas datas distintas se repetem em muitas linhas: formatar só as distintas
+        codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+        texto_unicos = np.append(unicos.strftime(FORMATO_DATA).to_numpy(dtype=object), "")
+        texto = pd.Series(texto_unicos[codigos], index=serie.index, dtype=object)
+    else:
+        texto = serie.astype(str)
+
+        # Colunas de data que o read_excel não conseguiu converter: formatar só as células com data
+        if coluna in COLUNAS_DATA and serie.dtype == object:
+            eh_data = serie.map(lambda valor: isinstance(valor, datetime.datetime)).to_numpy(dtype=bool)
+            if eh_data.any():
+                texto[eh_data] = pd.to_datetime(serie[eh_data]).dt.strftime(FORMATO_DATA)
+
+    valores = texto.to_numpy(dtype=object)
+
+    if coluna == "URL tarefa" and prefixar_url:
+        # Adicionar https:// nas URLs que não têm protocolo
+        sem_protocolo = ~ausentes & (texto != "").to_numpy() & ~texto.str.startswith(("http://", "https://")).to_numpy()
+        valores = np.where(sem_protocolo, "https://" + texto.to_numpy(dtype=object), valores)
+
+    valores[ausentes] = ""
+    return valores
+
+
+# Função para montar a tabela de exibição (todas as células já como texto)
+# Colunas que não existem no dataframe aparecem vazias, como nas tabelas da interface
+def construir_exibicao(df, colunas):
+    dados = {}
+    for col in colunas:
+        if col in df.columns:
+            dados[col] = formatar_coluna(df[col], col)
+        else:
+            dados[col] = np.full(len(df), "", dtype=object)
+    return pd.DataFrame(dados, index=df.index, dtype=object)
+
+
+# Função para montar o índice de pesquisa de cada coluna exibida
+# Cada coluna guarda os códigos das linhas e os valores distintos em minúsculas,
+# assim a pesquisa compara cada valor distinto uma única vez
+# Com df, a coluna de URL é indexada com o texto original: o "https://" acrescentado
+# na exibição não deve fazer "http" encontrar todas as linhas
+def construir_indice_pesquisa(exibicao, df=None):
+    indice = {}
+    for col in exibicao.columns:
+        textos = exibicao[col].to_numpy(dtype=object)
+        if col == "URL tarefa" and df is not None and col in df.columns:
+            textos = formatar_coluna(df[col], col, prefixar_url=False)
+        codigos, unicos = pd.factorize(textos)
+        indice[col] = (codigos, pd.Series(unicos, dtype=object).str.lower())
+    return indice
+
+
+# Função para calcular a máscara de linhas que contêm o termo em alguma coluna
+def mascara_pesquisa(indice, termo, total_linhas):
+    if termo == "":
+        return np.ones(total_linhas, dtype=bool)
+
+    mascara = np.zeros(total_linhas, dtype=bool)
+    for codigos, unicos in indice.values():
+        encontrados = unicos.str.contains(termo, regex=False).to_numpy(dtype=bool)
+        mascara |= encontrados[codigos]
+    return mascara
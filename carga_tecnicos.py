@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+
+from datas import converter_datas
+
+# Acima deste número de dias o mapa de carga passa a ser semanal
+MAX_DIAS_GRANULARIDADE_DIARIA = 62
+
+# Quantidade máxima de rótulos por eixo no mapa de calor
+MAX_ROTULOS_EIXO = 40
+
+# Período máximo coberto pelo mapa de carga (cerca de 10 anos, centrado na mediana das datas
+# de início); datas digitadas erradas (ex.: 2200 ou 9999) não fazem a matriz crescer sem limite
+MAX_DIAS_CARGA = 3660
+
+# 01/01/1970 foi uma quinta-feira: somar 3 dias alinha as semanas à segunda-feira
+DESLOCAMENTO_SEGUNDA = 3
+
+
+# Função para converter uma coluna de datas em número inteiro de dias desde 1970-01-01
+def _dias(serie):
+    serie = converter_datas(serie)
+    return serie.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]").astype(np.int64)
+
+
+# Função para calcular a carga de cada técnico ao longo do tempo
+# Recebe a saída de dividir_nomes_tecnicos (uma linha por técnico e tarefa)
+# A contagem usa um vetor de diferenças (+1 no início, -1 após o fim) e soma acumulada,
+# sem laços por dia ou por técnico
+def calcular_carga(df_expandido, granularidade="auto"):
+    inicio = converter_datas(df_expandido["Data Início"])
+    vencimento = converter_datas(df_expandido["Data Vencimento"])
+
+    # Considerar apenas tarefas com as duas datas; vencimento antes do início vira tarefa de um dia
+    validas = (inicio.notna() & vencimento.notna()).to_numpy()
+    if not validas.any():
+        return None
+
+    dia_inicio = _dias(inicio[validas])
+    dia_fim = np.maximum(_dias(vencimento[validas]), dia_inicio)
+    tecnicos_validos = df_expandido["Técnico"].to_numpy()[validas]
+
+    # Período longo demais: limitar a uma janela de MAX_DIAS_CARGA em torno da mediana das datas
+    # de início, reduzida às datas que caem dentro dela; tarefas fora da janela saem e as que
+    # a atravessam são cortadas nas bordas
+    if dia_fim.max() - dia_inicio.min() + 1 > MAX_DIAS_CARGA:
+        centro = int(np.median(dia_inicio))
+        janela_inicio = centro - MAX_DIAS_CARGA // 2
+        janela_fim = janela_inicio + MAX_DIAS_CARGA - 1
+        janela_inicio = max(janela_inicio, int(dia_inicio[dia_inicio >= janela_inicio].min()))
+        fins_dentro = dia_fim[dia_fim <= janela_fim]
+        if len(fins_dentro) > 0:
+            janela_fim = max(int(fins_dentro.max()), janela_inicio)
+        dentro = (dia_fim >= janela_inicio) & (dia_inicio <= janela_fim)
+        dia_inicio = np.maximum(dia_inicio[dentro], janela_inicio)
+        dia_fim = np.minimum(dia_fim[dentro], janela_fim)
+        tecnicos_validos = tecnicos_validos[dentro]
+
+    if granularidade == "auto":
+        extensao = dia_fim.max() - dia_inicio.min() + 1
+        granularidade = "dia" if extensao <= MAX_DIAS_GRANULARIDADE_DIARIA else "semana"
+
+    if granularidade == "semana":
+        periodo_inicio = (dia_inicio + DESLOCAMENTO_SEGUNDA) // 7
+        periodo_fim = (dia_fim + DESLOCAMENTO_SEGUNDA) // 7
+    else:
+        periodo_inicio, periodo_fim = dia_inicio, dia_fim
+
+    primeiro = periodo_inicio.min()
+    periodo_inicio = periodo_inicio - primeiro
+    periodo_fim = periodo_fim - primeiro
+    n_periodos = int(periodo_fim.max()) + 1
+
+    # Técnicos codificados como inteiros (0..n-1)
+    codigos, tecnicos = pd.factorize(tecnicos_validos)
+    n_tecnicos = len(tecnicos)
+
+    # Vetor de diferenças com uma coluna extra por técnico para o -1 após o último período
+    largura = n_periodos + 1
+    tamanho = n_tecnicos * largura
+    diferencas = (np.bincount(codigos * largura + periodo_inicio, minlength=tamanho)
+                  - np.bincount(codigos * largura + periodo_fim + 1, minlength=tamanho))
+    matriz = np.cumsum(diferencas.reshape(n_tecnicos, largura), axis=1)[:, :n_periodos]
+
+    # Ordenar os técnicos pela carga total (maior carga no topo)
+    ordem = np.argsort(-matriz.sum(axis=1), kind="stable")
+
+    if granularidade == "semana":
+        dias_periodos = (np.arange(n_periodos) + primeiro) * 7 - DESLOCAMENTO_SEGUNDA
+    else:
+        dias_periodos = np.arange(n_periodos) + primeiro
+    periodos = pd.to_datetime(dias_periodos.astype("datetime64[D]"))
+
+    return {
+        "granularidade": granularidade,
+        "tecnicos": np.asarray(tecnicos, dtype=object)[ordem],
+        "periodos": periodos,
+        "matriz": matriz[ordem].astype(np.int32),
+    }
+
+
+# Função para obter a série de tarefas abertas de um técnico ao longo do tempo
+def tarefas_abertas(carga, tecnico):
+    posicao = np.flatnonzero(carga["tecnicos"] == tecnico)
+    if len(posicao) == 0:
+        return pd.Series(dtype="int32")
+    return pd.Series(carga["matriz"][posicao[0]], index=carga["periodos"], name=tecnico)
+
+
+# Função para desenhar o mapa de calor em um eixo do matplotlib
+# Um único imshow independente do número de técnicos; os rótulos são espaçados para caber no eixo
+def desenhar_mapa_carga(ax, carga, fontsize=8):
+    matriz = carga["matriz"]
+    imagem = ax.imshow(matriz, aspect="auto", interpolation="nearest", cmap="YlOrRd")
+
+    n_tecnicos, n_periodos = matriz.shape
+    passo_y = max(1, int(np.ceil(n_tecnicos / MAX_ROTULOS_EIXO)))
+    passo_x = max(1, int(np.ceil(n_periodos / MAX_ROTULOS_EIXO)))
+
+    posicoes_y = np.arange(0, n_tecnicos, passo_y)
+    ax.set_yticks(posicoes_y)
+    ax.set_yticklabels(carga["tecnicos"][posicoes_y], fontsize=fontsize)
+
+    posicoes_x = np.arange(0, n_periodos, passo_x)
+    ax.set_xticks(posicoes_x)
+    ax.set_xticklabels(carga["periodos"][posicoes_x].strftime("%d/%m/%y"), fontsize=fontsize, rotation=90)
+
+    titulo = "Carga por Técnico (tarefas abertas por " + ("semana" if carga["granularidade"] == "semana" else "dia") + ")"
+    ax.set_title(titulo, fontsize=12, fontweight='bold')
+    return imagem
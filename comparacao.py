@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import take
+
+from tecnicos import normalizar_nome
+
+# Colunas comparadas entre as duas planilhas (a chave é "ID tarefa")
+COLUNA_CHAVE = "ID tarefa"
+COLUNAS_COMPARADAS = ["URL tarefa", "Projeto", "Atividade",
+                      "Data Início", "Data Vencimento", "Técnico"]
+
+SUFIXO_ANTERIOR = " (anterior)"
+SUFIXO_NOVA = " (nova)"
+
+# Situações possíveis de uma tarefa na comparação
+ADICIONADA = "Adicionada"
+REMOVIDA = "Removida"
+ALTERADA = "Alterada"
+SEM_ALTERACAO = "Sem alteração"
+
+# Linhas com ID repetido em cada planilha (ficam fora da comparação; só a primeira ocorrência é comparada)
+DUPLICADOS_ANTERIOR = "IDs duplicados na planilha anterior"
+DUPLICADOS_NOVA = "IDs duplicados na planilha nova"
+
+
+# Função para padronizar a lista de técnicos antes da comparação
+# ("paula grippa, João Dias" e "João Dias,Paula Grippa" são considerados iguais)
+def _padronizar_tecnicos(serie):
+    codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+    padronizados = []
+    for valor in unicos:
+        nomes = normalizar_nome(valor).split(",")
+        padronizados.append(",".join(sorted(normalizar_nome(nome) for nome in nomes)))
+    padronizados = np.append(np.asarray(padronizados, dtype=object), np.nan)
+    return pd.Series(padronizados[codigos], index=serie.index, dtype=object)
+
+
+# Função para comparar duas colunas considerando valores ausentes iguais entre si
+def _valores_diferentes(antes, depois):
+    ambos_ausentes = antes.isna() & depois.isna()
+    iguais = (antes == depois).fillna(False).astype(bool)
+    return (~(iguais | ambos_ausentes)).to_numpy()
+
+
+# Função para comparar duas planilhas usando junção por hash na coluna "ID tarefa"
+def comparar_planilhas(df_anterior, df_nova, colunas=COLUNAS_COMPARADAS):
+    colunas = [col for col in colunas if col in df_anterior.columns and col in df_nova.columns]
+
+    # IDs repetidos tornariam a junção ambígua: mantém-se a primeira ocorrência de cada um
+    # e a quantidade de linhas descartadas de cada lado vai para o resumo
+    repetidas_anterior = df_anterior.duplicated(COLUNA_CHAVE).to_numpy()
+    repetidas_nova = df_nova.duplicated(COLUNA_CHAVE).to_numpy()
+    anterior = df_anterior[~repetidas_anterior][[COLUNA_CHAVE] + colunas]
+    nova = df_nova[~repetidas_nova][[COLUNA_CHAVE] + colunas]
+
+    # Junção por hash: a tabela hash é montada com as chaves da planilha anterior
+    # e cada chave da planilha nova é procurada nela (sem ordenar as chaves)
+    indice_anterior = pd.Index(anterior[COLUNA_CHAVE])
+    posicoes_anterior = indice_anterior.get_indexer(nova[COLUNA_CHAVE])
+
+    # Linhas da planilha anterior que não foram encontradas na nova
+    encontradas = np.zeros(len(anterior), dtype=bool)
+    encontradas[posicoes_anterior[posicoes_anterior >= 0]] = True
+    posicoes_removidas = np.flatnonzero(~encontradas)
+
+    # Pares (anterior, nova) da junção externa; -1 indica que o lado não existe
+    lado_anterior = np.concatenate([posicoes_anterior, posicoes_removidas])
+    lado_nova = np.concatenate([np.arange(len(nova)), np.full(len(posicoes_removidas), -1)])
+
+    so_anterior = lado_nova < 0
+    so_nova = lado_anterior < 0
+    em_ambas = ~so_anterior & ~so_nova
+
+    # Toda linha da junção tem a chave de um dos lados: primeiro as linhas da planilha nova,
+    # depois as removidas; as chaves são concatenadas (sem preencher com NaN) e mantêm o tipo original
+    chaves = pd.concat([nova[COLUNA_CHAVE], anterior[COLUNA_CHAVE].iloc[posicoes_removidas]], ignore_index=True)
+    juncao = pd.DataFrame({COLUNA_CHAVE: chaves})
+    for col in colunas:
+        juncao[col + SUFIXO_ANTERIOR] = take(anterior[col].to_numpy(), lado_anterior, allow_fill=True)
+    for col in colunas:
+        juncao[col + SUFIXO_NOVA] = take(nova[col].to_numpy(), lado_nova, allow_fill=True)
+
+    # Uma máscara de alteração por coluna, calculada só com operações vetorizadas
+    alteracoes = np.zeros((len(juncao), len(colunas)), dtype=bool)
+    for i, col in enumerate(colunas):
+        antes = juncao[col + SUFIXO_ANTERIOR]
+        depois = juncao[col + SUFIXO_NOVA]
+        if col == "Técnico":
+            antes = _padronizar_tecnicos(antes)
+            depois = _padronizar_tecnicos(depois)
+        alteracoes[:, i] = _valores_diferentes(antes, depois) & em_ambas
+
+    alterada = alteracoes.any(axis=1)
+
+    situacao = np.full(len(juncao), SEM_ALTERACAO, dtype=object)
+    situacao[alterada] = ALTERADA
+    situacao[so_anterior] = REMOVIDA
+    situacao[so_nova] = ADICIONADA
+
+    # Descrição das colunas alteradas (montada só para as linhas alteradas)
+    descricao = np.full(len(juncao), "", dtype=object)
+    posicoes = np.flatnonzero(alterada)
+    if len(posicoes):
+        parcial = np.full(len(posicoes), "", dtype=object)
+        for i, col in enumerate(colunas):
+            separador = np.where(parcial == "", "", ", ")
+            parcial = np.where(alteracoes[posicoes, i], parcial + separador + col, parcial)
+        descricao[posicoes] = parcial
+
+    juncao.insert(1, "Situação", situacao)
+    juncao.insert(2, "Colunas alteradas", descricao)
+
+    resumo = {
+        ADICIONADA: int(so_nova.sum()),
+        REMOVIDA: int(so_anterior.sum()),
+        ALTERADA: int(alterada.sum()),
+        SEM_ALTERACAO: int((em_ambas & ~alterada).sum()),
+        DUPLICADOS_ANTERIOR: int(repetidas_anterior.sum()),
+        DUPLICADOS_NOVA: int(repetidas_nova.sum()),
+    }
+    alteracoes_por_coluna = dict(zip(colunas, alteracoes.sum(axis=0).tolist()))
+
+    return {
+        "diferencas": juncao[situacao != SEM_ALTERACAO].reset_index(drop=True),
+        "resumo": resumo,
+        "alteracoes_por_coluna": alteracoes_por_coluna,
+    }
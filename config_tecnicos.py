@@ -0,0 +1,187 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from tecnicos import normalizar_nome
+
+# Arquivo de configuração padrão (ao lado do aplicativo)
+CAMINHO_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config_tecnicos.json")
+
+ROTULO_SEM_SQUAD = "Sem squad"
+
+# Configuração usada quando o arquivo não existe
+CONFIG_PADRAO = {
+    "equipe_padrao": "Padrão",
+    "equipes": {
+        "Padrão": {
+            "excluidos": ["João Gabriel", "Isabella Cristina", "Paula Grippa"],
+            "squads": {},
+        },
+    },
+    "aliases": {},
+}
+
+
+# Funções para conferir o formato de cada parte da configuração (erros com o caminho do valor)
+def _exigir_dicionario(valor, onde):
+    if valor is None:
+        return {}
+    if not isinstance(valor, dict):
+        raise ValueError(f"Configuração inválida: \"{onde}\" deve ser um objeto {{...}}")
+    return valor
+
+
+def _nomes(valor, onde):
+    if valor is None:
+        return []
+    # Um texto solto seria percorrido letra por letra
+    if not isinstance(valor, list) or not all(isinstance(nome, str) for nome in valor):
+        raise ValueError(f"Configuração inválida: \"{onde}\" deve ser uma lista de nomes [\"...\"]")
+    return [normalizar_nome(nome) for nome in valor]
+
+
+# Função para validar e padronizar a configuração (nomes normalizados como nos dados)
+def normalizar_config(config):
+    if not isinstance(config, dict):
+        raise ValueError("Configuração inválida: o arquivo deve conter um objeto {...}")
+    equipes = _exigir_dicionario(config.get("equipes"), "equipes")
+    if not equipes:
+        raise ValueError("A configuração precisa ter ao menos uma equipe em \"equipes\"")
+
+    equipes_normalizadas = {}
+    for equipe, definicao in equipes.items():
+        definicao = _exigir_dicionario(definicao, f"equipes.{equipe}")
+        squads = {}
+        for squad, membros in _exigir_dicionario(definicao.get("squads"), f"equipes.{equipe}.squads").items():
+            squads[str(squad)] = _nomes(membros, f"equipes.{equipe}.squads.{squad}")
+        equipes_normalizadas[str(equipe)] = {
+            "excluidos": _nomes(definicao.get("excluidos"), f"equipes.{equipe}.excluidos"),
+            "squads": squads,
+        }
+
+    equipe_padrao = config.get("equipe_padrao")
+    if equipe_padrao not in equipes_normalizadas:
+        equipe_padrao = next(iter(equipes_normalizadas))
+
+    aliases = {}
+    for apelido, nome in _exigir_dicionario(config.get("aliases"), "aliases").items():
+        if not isinstance(nome, str):
+            raise ValueError(f"Configuração inválida: \"aliases.{apelido}\" deve ser um nome \"...\"")
+        aliases[normalizar_nome(apelido)] = normalizar_nome(nome)
+
+    return {"equipe_padrao": equipe_padrao, "equipes": equipes_normalizadas, "aliases": aliases}
+
+
+# Função para obter a configuração padrão já normalizada (sem ler o arquivo)
+def config_padrao():
+    return normalizar_config(CONFIG_PADRAO)
+
+
+# Função para carregar a configuração de exclusões, squads e apelidos dos técnicos
+def carregar_config(caminho=CAMINHO_CONFIG):
+    if not os.path.exists(caminho):
+        return config_padrao()
+
+    with open(caminho, encoding="utf-8") as arquivo:
+        try:
+            config = json.load(arquivo)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Arquivo de configuração inválido ({os.path.basename(caminho)}): {e}")
+    return normalizar_config(config)
+
+
+# Função para resolver a configuração de uma equipe sobre o dicionário de técnicos
+# O resultado são arrays alinhados ao dicionário (um item por técnico distinto, não por linha):
+# "excluido" (bool) e "grupo" (índice do squad em "grupos"; o último grupo é "Sem squad")
+def resolver_config(config, equipe, dicionario):
+    dicionario = pd.Index(dicionario)
+    definicao = config["equipes"].get(equipe) or config["equipes"][config["equipe_padrao"]]
+
+    excluido = dicionario.isin(definicao["excluidos"])
+
+    grupos = list(definicao["squads"]) + [ROTULO_SEM_SQUAD]
+    grupo = np.full(len(dicionario), len(grupos) - 1, dtype=np.int64)
+    # Squads em ordem inversa: um técnico em mais de um squad fica no primeiro listado
+    for indice in range(len(grupos) - 2, -1, -1):
+        grupo[dicionario.isin(definicao["squads"][grupos[indice]])] = indice
+
+    return {
+        "equipe": equipe if equipe in config["equipes"] else config["equipe_padrao"],
+        "dicionario": dicionario,
+        "excluido": np.asarray(excluido, dtype=bool),
+        "grupo": grupo,
+        "grupos": grupos,
+    }
+
+
+# Função para obter os códigos (posição no dicionário) de uma lista de nomes; -1 se não existir
+def codigos_tecnicos(resolucao, nomes):
+    return resolucao["dicionario"].get_indexer(pd.Index(nomes))
+
+
+def _mascaras(resolucao, nomes):
+    codigos = codigos_tecnicos(resolucao, nomes)
+    conhecidos = codigos >= 0
+    codigos_validos = np.where(conhecidos, codigos, 0)
+    manter = ~(conhecidos & resolucao["excluido"][codigos_validos])
+    grupos = np.where(conhecidos, resolucao["grupo"][codigos_validos], len(resolucao["grupos"]) - 1)
+    return manter, grupos
+
+
+# Função para aplicar os apelidos a uma contagem já agregada por técnico (soma os nomes que viram o mesmo)
+def aplicar_aliases_em_contagem(contagem, aliases):
+    if contagem is None or not aliases:
+        return contagem
+    return contagem.groupby(contagem.index.map(lambda nome: aliases.get(nome, nome)), sort=False).sum()
+
+
+# Função para aplicar a exclusão (e, se pedido, o agrupamento por squad) a uma contagem por técnico
+def aplicar_em_contagem(contagem, resolucao, agrupar=False):
+    if contagem is None or resolucao is None:
+        return contagem
+
+    manter, grupos = _mascaras(resolucao, contagem.index)
+    contagem = contagem[manter]
+    if not agrupar:
+        return contagem
+
+    somas = np.bincount(grupos[manter], weights=contagem.to_numpy(), minlength=len(resolucao["grupos"]))
+    agrupada = pd.Series(somas.astype(np.int64), index=pd.Index(resolucao["grupos"], name="Squad"))
+    return agrupada[agrupada > 0]
+
+
+# Função para aplicar a exclusão (e o agrupamento por squad) ao mapa de carga Técnico x período
+def aplicar_em_carga(carga, resolucao, agrupar=False):
+    if carga is None or resolucao is None:
+        return carga
+
+    manter, grupos = _mascaras(resolucao, carga["tecnicos"])
+    matriz = carga["matriz"][manter]
+    tecnicos = np.asarray(carga["tecnicos"], dtype=object)[manter]
+
+    if agrupar:
+        somas = np.zeros((len(resolucao["grupos"]), matriz.shape[1]), dtype=np.int64)
+        np.add.at(somas, grupos[manter], matriz)
+        com_tarefas = somas.sum(axis=1) > 0
+        # Squads com mais carga no topo, como os técnicos
+        ordem = np.flatnonzero(com_tarefas)[np.argsort(-somas[com_tarefas].sum(axis=1), kind="stable")]
+        matriz = somas[ordem].astype(carga["matriz"].dtype)
+        tecnicos = np.asarray(resolucao["grupos"], dtype=object)[ordem]
+
+    if len(tecnicos) == 0:
+        return None
+
+    resultado = dict(carga)
+    resultado["tecnicos"] = tecnicos
+    resultado["matriz"] = matriz
+    return resultado
+
+
+# Função para remover os técnicos excluídos de uma tabela indexada por técnico (ex.: durações)
+def aplicar_em_tabela(tabela, resolucao):
+    if tabela is None or resolucao is None:
+        return tabela
+    manter, _ = _mascaras(resolucao, tabela.index)
+    return tabela[manter]
@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+
+from cache_visoes import CacheVisoes, normalizar_descritor
+from camada_exibicao import construir_exibicao, construir_indice_pesquisa, mascara_pesquisa
+from ordenacao import calcular_permutacao
+from memoria_compartilhada import TabelaCompartilhada
+from metricas import criar_grafo_tarefas, atualizar_hoje
+
+# Colunas exibidas na tabela de dados e usadas na pesquisa
+COLUNAS_TABELA = ["ID tarefa", "URL tarefa", "Projeto", "Atividade",
+                  "Data Início", "Data Vencimento", "Técnico"]
+
+
+# Conjunto de dados carregado no dashboard, com versão para invalidar caches derivados
+class ConjuntoDados:
+    def __init__(self, df, cache=None, config=None):
+        self.df = df
+        self.versao = 0
+        self.cache = cache if cache is not None else CacheVisoes()
+        self._exibicao = None
+        self._indice_pesquisa = None
+        self._permutacoes = {}
+        self._tabela_compartilhada = None
+        # Valores derivados (técnicos expandidos, contagens, durações, métricas) calculados sob demanda
+        self.grafo = criar_grafo_tarefas(df, config)
+        # Mostrar técnicos agrupados por squad nos gráficos e exportações
+        self.agrupar_squads = False
+
+    # Substitui os dados; tudo que estava em cache para a versão anterior deixa de ser usado
+    def substituir(self, df):
+        self.df = df
+        self.versao += 1
+        self.cache.limpar()
+        self._exibicao = None
+        self._indice_pesquisa = None
+        self._permutacoes = {}
+        self.liberar()
+        self.grafo.definir_entrada("dados", df)
+
+    # Acrescenta linhas novas ao conjunto (os derivados são recalculados sob demanda)
+    def anexar_linhas(self, df_novas):
+        self.substituir(pd.concat([self.df, df_novas], ignore_index=True))
+
+    # Altera os apelidos de técnicos; só os derivados que usam os nomes são recalculados
+    def definir_aliases(self, aliases):
+        self.grafo.definir_entrada("aliases", dict(aliases or {}))
+
+    # Aplica uma nova configuração de técnicos sem recarregar os dados
+    # Exclusões e squads só recalculam a resolução sobre o dicionário de técnicos;
+    # os apelidos só são reaplicados se mudaram
+    def definir_config(self, config, equipe=None):
+        if equipe is None:
+            equipe = self.grafo.obter("equipe")
+        self.grafo.definir_entrada("config", config)
+        self.grafo.definir_entrada("equipe", equipe if equipe in config["equipes"] else config["equipe_padrao"])
+        if config["aliases"] != self.grafo.obter("aliases"):
+            self.definir_aliases(config["aliases"])
+
+    def definir_equipe(self, equipe):
+        self.grafo.definir_entrada("equipe", equipe)
+
+    # Exclusões e squads da equipe ativa, resolvidos sobre o dicionário de técnicos
+    @property
+    def resolucao_tecnicos(self):
+        return self.grafo.obter("resolucao_tecnicos")
+
+    # Opções de técnicos enviadas aos processos de exportação (valores pequenos, sem os dados)
+    def opcoes_tecnicos(self):
+        return {
+            "config": self.grafo.obter("config"),
+            "equipe": self.grafo.obter("equipe"),
+            "agrupar_squads": self.agrupar_squads,
+        }
+
+    # Data de referência dos prazos: o dashboard pode ficar aberto de um dia para o outro
+    # Retorna True se o dia mudou (os prazos serão recalculados na próxima leitura)
+    def atualizar_hoje(self):
+        return atualizar_hoje(self.grafo)
+
+    # Métricas principais (mesmo cálculo da aba de Métricas e das exportações)
+    @property
+    def metricas(self):
+        self.atualizar_hoje()
+        return self.grafo.obter("metricas")
+
+    # Textos de exibição de todas as células (datas, URLs e vazios já formatados)
+    # Calculados uma vez por versão e usados pela tabela, pesquisa, intercorrências e PDF
+    @property
+    def exibicao(self):
+        if self._exibicao is None or self._exibicao[0] != self.versao:
+            self._exibicao = (self.versao, construir_exibicao(self.df, COLUNAS_TABELA))
+        return self._exibicao[1]
+
+    @property
+    def indice_pesquisa(self):
+        if self._indice_pesquisa is None or self._indice_pesquisa[0] != self.versao:
+            self._indice_pesquisa = (self.versao, construir_indice_pesquisa(self.exibicao, self.df))
+        return self._indice_pesquisa[1]
+
+    # Tabela publicada em memória compartilhada para os processos de exportação
+    # Publicada uma vez por versão; os processos recebem só o descritor
+    @property
+    def tabela_compartilhada(self):
+        if self._tabela_compartilhada is None or self._tabela_compartilhada[0] != self.versao:
+            self.liberar()
+            self._tabela_compartilhada = (self.versao, TabelaCompartilhada(self.df))
+        return self._tabela_compartilhada[1]
+
+    # Libera a memória compartilhada (ao substituir os dados ou fechar o dashboard)
+    def liberar(self):
+        if self._tabela_compartilhada is not None:
+            self._tabela_compartilhada[1].liberar()
+            self._tabela_compartilhada = None
+
+    # Permutação que ordena a coluna (calculada na primeira vez que a coluna é ordenada)
+    # Retorna a permutação crescente e a quantidade de linhas com valor
+    def permutacao(self, coluna):
+        if coluna not in self._permutacoes:
+            self._permutacoes[coluna] = calcular_permutacao(self.df[coluna])
+        return self._permutacoes[coluna]
+
+    # Retorna a visão filtrada (linhas, agregados e dados dos gráficos) para uma pesquisa
+    def obter_visao(self, termo="", filtros=None):
+        descritor = normalizar_descritor(termo, filtros)
+        # A versão dos aliases entra na chave: os gráficos usam os nomes já traduzidos
+        chave = (descritor, self.versao, self.grafo.versao("aliases"))
+        return self.cache.obter_ou_calcular(chave, lambda: self._calcular_visao(descritor))
+
+    def _calcular_visao(self, descritor):
+        termo, filtros = descritor
+        df = self.df
+
+        # Sem pesquisa e sem filtros: a visão completa vem do grafo de derivados
+        if termo == "" and not filtros:
+            return {
+                "linhas": np.arange(len(df)),
+                "total": len(df),
+                "total_projetos": df["Projeto"].nunique() if "Projeto" in df.columns else 0,
+                "graficos": self.grafo.obter("graficos"),
+            }
+
+        mascara = mascara_pesquisa(self.indice_pesquisa, termo, len(df))
+        for coluna, valores in filtros:
+            if coluna in df.columns:
+                mascara &= df[coluna].astype(str).isin(valores).to_numpy()
+
+        linhas = np.flatnonzero(mascara)
+        df_filtrado = df.iloc[linhas]
+
+        return {
+            "linhas": linhas,
+            "total": len(linhas),
+            "total_projetos": df_filtrado["Projeto"].nunique() if "Projeto" in df_filtrado.columns else 0,
+            # Selecionados das linhas expandidas do grafo (tempo em "graficos_filtrados" nas estatísticas)
+            "graficos": self.grafo.obter_com_entrada("graficos_filtrados", "filtro", mascara),
+        }
@@ -0,0 +1,10 @@
+import pandas as pd
+
+
+# Função para converter uma coluna de datas sem falhar em valores inválidos (viram NaT)
+# Datas digitadas como texto seguem o padrão brasileiro (dia/mês/ano); usada por todos
+# os módulos para que validação, métricas, durações e carga leiam as mesmas datas
+def converter_datas(serie):
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie
+    return pd.to_datetime(serie, errors="coerce", dayfirst=True)
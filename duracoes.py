@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+
+from tecnicos import dividir_nomes_tecnicos
+from datas import converter_datas
+
+# Percentis calculados para as durações das tarefas
+PERCENTIS = {"Mediana": 0.5, "P90": 0.9, "P99": 0.99}
+
+# Tarefas com vencimento entre hoje e hoje + DIAS_A_VENCER contam como "a vencer"
+DIAS_A_VENCER = 3
+
+# Quantidade máxima de barras do histograma de durações
+MAX_BARRAS_HISTOGRAMA = 30
+
+
+# Função para calcular a duração (em dias) de cada tarefa
+def calcular_duracoes(df):
+    inicio = converter_datas(df["Data Início"])
+    vencimento = converter_datas(df["Data Vencimento"])
+    return (vencimento - inicio).dt.days.to_numpy(dtype=float)
+
+
+# Função para calcular contagem, média e percentis por grupo com uma única ordenação
+# Os valores são ordenados por (grupo, valor); cada grupo ocupa um trecho contínuo
+# e os percentis são lidos por posição dentro do trecho (interpolação linear, como no pandas)
+def estatisticas_por_grupo(codigos, valores, nomes_grupos):
+    validos = (codigos >= 0) & ~np.isnan(valores)
+    codigos = codigos[validos]
+    valores = valores[validos]
+    n_grupos = len(nomes_grupos)
+
+    ordem = np.lexsort((valores, codigos))
+    valores_ordenados = valores[ordem]
+
+    contagens = np.bincount(codigos, minlength=n_grupos)
+    inicios = np.cumsum(contagens) - contagens
+    somas = np.bincount(codigos, weights=valores, minlength=n_grupos)
+
+    com_dados = contagens > 0
+    resultado = pd.DataFrame(index=pd.Index(nomes_grupos, name="Grupo"))
+    resultado["Tarefas"] = contagens
+    resultado["Média"] = np.where(com_dados, somas / np.maximum(contagens, 1), np.nan)
+
+    for nome, q in PERCENTIS.items():
+        posicao = inicios + q * np.maximum(contagens - 1, 0)
+        abaixo = np.floor(posicao).astype(np.int64)
+        acima = np.ceil(posicao).astype(np.int64)
+        fracao = posicao - abaixo
+        if len(valores_ordenados):
+            abaixo = np.minimum(abaixo, len(valores_ordenados) - 1)
+            acima = np.minimum(acima, len(valores_ordenados) - 1)
+            percentil = valores_ordenados[abaixo] + (valores_ordenados[acima] - valores_ordenados[abaixo]) * fracao
+        else:
+            percentil = np.full(n_grupos, np.nan)
+        resultado[nome] = np.where(com_dados, percentil, np.nan)
+
+    return resultado.sort_values("Tarefas", ascending=False)
+
+
+# Função para calcular o histograma das durações
+def histograma_duracoes(duracoes, max_barras=MAX_BARRAS_HISTOGRAMA):
+    duracoes = duracoes[~np.isnan(duracoes)]
+    if len(duracoes) == 0:
+        return np.array([]), np.array([0.0, 1.0])
+
+    minimo, maximo = duracoes.min(), duracoes.max()
+    # Barras de um dia quando couberem; caso contrário, max_barras faixas iguais
+    n_barras = int(min(max_barras, maximo - minimo + 1))
+    return np.histogram(duracoes, bins=n_barras, range=(minimo, maximo + 1))
+
+
+# Função principal: durações, estatísticas por projeto e técnico e prazos em relação a hoje
+def analisar_duracoes(df, df_expandido=None, hoje=None):
+    if df_expandido is None:
+        df_expandido = dividir_nomes_tecnicos(df)
+    if hoje is None:
+        hoje = pd.Timestamp.today().normalize()
+
+    duracoes = calcular_duracoes(df)
+
+    # Estatísticas gerais (um único grupo)
+    geral = estatisticas_por_grupo(np.zeros(len(duracoes), dtype=np.int64), duracoes, ["Geral"]).iloc[0]
+
+    codigos_projeto, projetos = pd.factorize(df["Projeto"])
+    por_projeto = estatisticas_por_grupo(codigos_projeto, duracoes, projetos)
+    por_projeto.index.name = "Projeto"
+
+    codigos_tecnico, tecnicos = pd.factorize(df_expandido["Técnico"])
+    por_tecnico = estatisticas_por_grupo(codigos_tecnico, calcular_duracoes(df_expandido), tecnicos)
+    por_tecnico.index.name = "Técnico"
+
+    # Prazos em relação a hoje
+    vencimento = converter_datas(df["Data Vencimento"])
+    vencidas = int((vencimento < hoje).sum())
+    a_vencer = int(((vencimento >= hoje) & (vencimento <= hoje + pd.Timedelta(days=DIAS_A_VENCER))).sum())
+
+    contagens, limites = histograma_duracoes(duracoes)
+
+    return {
+        "geral": geral,
+        "por_projeto": por_projeto,
+        "por_tecnico": por_tecnico,
+        "vencidas": vencidas,
+        "a_vencer": a_vencer,
+        "histograma": (contagens, limites),
+    }
+
+
+# Função para formatar um número de dias para exibição ("N/A" quando não há dados)
+def formatar_dias(valor):
+    if valor is None or pd.isna(valor):
+        return "N/A"
+    return str(round(float(valor), 1))
+
+
+# Função para desenhar o histograma de durações em um eixo do matplotlib
+def desenhar_histograma(ax, histograma, fontsize=8):
+    contagens, limites = histograma
+    if len(contagens):
+        ax.stairs(contagens, limites, fill=True, color="#4682B4")
+    ax.set_title("Distribuição da Duração das Tarefas", fontsize=12, fontweight='bold')
+    ax.set_xlabel("Duração (dias)", fontsize=10)
+    ax.set_ylabel("Tarefas", fontsize=10)
+    ax.tick_params(labelsize=fontsize)
+    ax.grid(True, axis='y', linestyle='--', alpha=0.7)
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
@@ -0,0 +1,471 @@
+import base64
+import html
+import json
+import re
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from tecnicos import dividir_combinacao
+from camada_exibicao import construir_exibicao
+from conjunto_dados import COLUNAS_TABELA
+from datas import converter_datas
+from metricas import criar_grafo_tarefas
+from config_tecnicos import resolver_config, aplicar_em_tabela
+from duracoes import DIAS_A_VENCER, formatar_dias
+from graficos_categorias import MAX_CATEGORIAS_GRAFICO
+
+# Situações de prazo usadas como dimensão do cubo
+SITUACOES = ["Vencida", f"Vence em até {DIAS_A_VENCER} dias", "No prazo", "Sem vencimento"]
+
+ROTULO_VAZIO = "(vazio)"
+
+# Nível de compressão das linhas (1 = mais rápido; os códigos repetidos já comprimem bem)
+NIVEL_COMPRESSAO = 1
+
+
+# Função para codificar uma coluna como dicionário (valores distintos + código por linha)
+# Valores ausentes recebem o código de um item extra no final do dicionário
+def _codificar(serie, rotulo_ausente=ROTULO_VAZIO, ordenar=False):
+    codigos, valores = pd.factorize(serie, sort=ordenar, use_na_sentinel=True)
+    valores = [str(valor) for valor in valores]
+    if (codigos < 0).any():
+        codigos = np.where(codigos < 0, len(valores), codigos)
+        valores.append(rotulo_ausente)
+    return codigos.astype(np.int64), valores
+
+
+# Função para calcular a situação de prazo de cada tarefa em relação a hoje
+def _codigos_situacao(df, hoje):
+    if "Data Vencimento" not in df.columns:
+        return np.full(len(df), 3, dtype=np.int64)
+
+    vencimento = converter_datas(df["Data Vencimento"])
+    limite = hoje + pd.Timedelta(days=DIAS_A_VENCER)
+    return np.select(
+        [vencimento.isna().to_numpy(), (vencimento < hoje).to_numpy(), (vencimento <= limite).to_numpy()],
+        [3, 0, 1],
+        default=2,
+    ).astype(np.int64)
+
+
+# Função para montar o cubo agregado Projeto x Combinação de técnicos x Dia de início x Situação
+# Cada célula guarda a quantidade de tarefas; as combinações apontam para a lista de técnicos,
+# assim filtrar por técnico não conta a mesma tarefa duas vezes
+# aliases (apelido -> nome) é aplicado sobre as combinações distintas, não sobre as linhas
+# Retorna o cubo e a célula de cada linha (usada para filtrar as linhas na página)
+def montar_cubo(df, hoje, aliases=None):
+    codigos_projeto, projetos = _codificar(df["Projeto"])
+
+    if "Técnico" in df.columns:
+        codigos_combinacao, combinacoes = pd.factorize(df["Técnico"], use_na_sentinel=True)
+        listas = [dividir_combinacao(valor) for valor in combinacoes] + [dividir_combinacao(None)]
+        codigos_combinacao = np.where(codigos_combinacao < 0, len(combinacoes), codigos_combinacao)
+    else:
+        codigos_combinacao = np.zeros(len(df), dtype=np.int64)
+        listas = [[]]
+
+    if aliases:
+        # dict.fromkeys remove nomes repetidos quando dois apelidos viram o mesmo técnico
+        listas = [list(dict.fromkeys(aliases.get(nome, nome) for nome in lista)) for lista in listas]
+
+    # Dicionário único de técnicos; cada combinação vira a lista de códigos dos seus técnicos
+    codigos_nomes, tecnicos = pd.factorize(pd.Index([nome for lista in listas for nome in lista], dtype=object))
+    tamanhos = np.array([len(lista) for lista in listas], dtype=np.int64)
+    combinacoes_tecnicos = [parte.tolist() for parte in np.split(codigos_nomes, np.cumsum(tamanhos)[:-1])]
+
+    if "Data Início" in df.columns:
+        dias = converter_datas(df["Data Início"]).dt.normalize()
+        codigos_dia, valores_dia = pd.factorize(dias, sort=True, use_na_sentinel=True)
+        nomes_dias = [dia.strftime("%Y-%m-%d") for dia in valores_dia]
+        codigos_dia = np.where(codigos_dia < 0, len(nomes_dias), codigos_dia)
+        nomes_dias.append("")
+    else:
+        codigos_dia = np.zeros(len(df), dtype=np.int64)
+        nomes_dias = [""]
+
+    codigos_situacao = _codigos_situacao(df, hoje)
+
+    # Uma chave inteira por linha; np.unique agrupa as linhas nas células do cubo
+    n_combinacoes = len(listas)
+    n_dias = len(nomes_dias)
+    n_situacoes = len(SITUACOES)
+    chave = ((codigos_projeto * n_combinacoes + codigos_combinacao) * n_dias + codigos_dia) * n_situacoes + codigos_situacao
+    celulas, celula_por_linha, contagens = np.unique(chave, return_inverse=True, return_counts=True)
+
+    resto, situacao = np.divmod(celulas, n_situacoes)
+    resto, dia = np.divmod(resto, n_dias)
+    projeto, combinacao = np.divmod(resto, n_combinacoes)
+
+    cubo = {
+        "projetos": projetos,
+        "tecnicos": [str(nome) for nome in tecnicos],
+        "combinacoes": combinacoes_tecnicos,
+        "dias": nomes_dias,
+        "situacoes": SITUACOES,
+        "celulas": {
+            "p": projeto.tolist(),
+            "c": combinacao.tolist(),
+            "d": dia.tolist(),
+            "s": situacao.tolist(),
+            "n": contagens.tolist(),
+        },
+    }
+    return cubo, celula_por_linha
+
+
+# Função para montar a carga de linhas em formato colunar (colunas codificadas como dicionário)
+# Com compressão, o JSON é comprimido com zlib e embutido em base64 (a página usa DecompressionStream)
+def montar_linhas(exibicao, celula_por_linha, comprimir=True):
+    colunas = list(exibicao.columns)
+    valores = {}
+    codigos = {}
+    for col in colunas:
+        codigos_coluna, valores_coluna = pd.factorize(exibicao[col].to_numpy(dtype=object))
+        valores[col] = [str(valor) for valor in valores_coluna]
+        codigos[col] = codigos_coluna.tolist()
+
+    conteudo = json.dumps({
+        "colunas": colunas,
+        "valores": valores,
+        "codigos": codigos,
+        "celula": celula_por_linha.tolist(),
+    }, ensure_ascii=False, separators=(",", ":"))
+
+    if comprimir:
+        return {"formato": "deflate", "conteudo": base64.b64encode(zlib.compress(conteudo.encode("utf-8"), NIVEL_COMPRESSAO)).decode("ascii")}
+    return {"formato": "json", "conteudo": conteudo}
+
+
+# Função para montar os cards fixos com as mesmas métricas da aba de Métricas
+def _cards_metricas(metricas):
+    geral = metricas["duracoes"]["geral"]
+    validacao = metricas["validacao"]
+    return [
+        ["Total de Tarefas", str(metricas["total_tarefas"])],
+        ["Total de Projetos", str(metricas["total_projetos"])],
+        ["Dia com Mais Tarefas", f"{metricas['dia_formatado']} ({metricas['qtd_tarefas_dia']} tarefas)"],
+        ["Projeto com Mais Tarefas", f"{metricas['projeto_mais_tarefas']} ({metricas['qtd_tarefas_projeto']} tarefas)"],
+        ["Técnico com Mais Tarefas", f"{metricas['tecnico_mais_tarefas']} ({metricas['qtd_tarefas_tecnico']} tarefas)"],
+        ["Erros", f"{validacao['total_linhas_com_erro']} ({validacao['total_ocorrencias']} ocorrências)"],
+        ["Duração Média / Mediana (dias)", f"{formatar_dias(geral['Média'])} / {formatar_dias(geral['Mediana'])} "
+                                           f"(P90: {formatar_dias(geral['P90'])} | P99: {formatar_dias(geral['P99'])})"],
+        ["Tarefas Vencidas", str(metricas["duracoes"]["vencidas"])],
+        [f"Vencem em até {DIAS_A_VENCER} dias", str(metricas["duracoes"]["a_vencer"])],
+    ]
+
+
+# Função para montar a tabela de durações por técnico (uma linha por técnico, sem os excluídos)
+def _tabela_duracoes(metricas, resolucao):
+    linhas = []
+    for tecnico, linha in aplicar_em_tabela(metricas["duracoes"]["por_tecnico"], resolucao).iterrows():
+        linhas.append([str(tecnico), int(linha["Tarefas"])] +
+                      [formatar_dias(linha[col]) for col in ["Média", "Mediana", "P90", "P99"]])
+    return linhas
+
+
+# Função para embutir um valor JSON com segurança dentro de uma tag <script>
+def _json_para_script(valor):
+    return json.dumps(valor, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+
+
+# Função principal: gera o dashboard HTML autocontido (sem interface gráfica)
+# exibicao pode receber a camada de exibição já calculada (ConjuntoDados.exibicao)
+# grafo pode receber o grafo de derivados já calculado (ConjuntoDados.grafo), com a configuração de técnicos;
+# sem ele usa a configuração padrão
+def gerar_html(df, caminho, exibicao=None, grafo=None, agrupar_squads=False, incluir_linhas=True, comprimir=True,
+               hoje=None, titulo="Dashboard de Métricas"):
+    if grafo is None:
+        grafo = criar_grafo_tarefas(df, hoje=hoje)
+    if hoje is None:
+        hoje = grafo.obter("hoje")
+
+    metricas = grafo.obter("metricas")
+    cubo, celula_por_linha = montar_cubo(df, hoje, grafo.obter("aliases"))
+
+    # Exclusões e squads da equipe resolvidos sobre o dicionário de técnicos do cubo
+    resolucao = resolver_config(grafo.obter("config"), grafo.obter("equipe"), cubo["tecnicos"])
+    cubo["excluido"] = resolucao["excluido"].astype(np.int64).tolist()
+    cubo["grupo"] = resolucao["grupo"].tolist()
+    cubo["grupos"] = resolucao["grupos"]
+
+    dados = {
+        "titulo": titulo,
+        "gerado_em": pd.Timestamp.now().strftime("%d/%m/%Y %H:%M"),
+        "max_categorias": MAX_CATEGORIAS_GRAFICO,
+        "metricas": _cards_metricas(metricas),
+        "duracoes": _tabela_duracoes(metricas, grafo.obter("resolucao_tecnicos")),
+        "equipe": resolucao["equipe"],
+        "agrupar_squads": bool(agrupar_squads),
+        "cubo": cubo,
+    }
+
+    linhas = None
+    if incluir_linhas:
+        if exibicao is None:
+            exibicao = construir_exibicao(df, COLUNAS_TABELA)
+        linhas = montar_linhas(exibicao, celula_por_linha, comprimir)
+
+    # Substituição em uma única passada, para que textos dos dados nunca sejam tratados como marcadores
+    substituicoes = {
+        "TITULO": html.escape(titulo),
+        "DADOS": _json_para_script(dados),
+        "LINHAS": _json_para_script(linhas),
+    }
+    conteudo = re.sub(r"__(TITULO|DADOS|LINHAS)__", lambda marcador: substituicoes[marcador.group(1)], MODELO_HTML)
+
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        arquivo.write(conteudo)
+    return caminho
+
+
+MODELO_HTML = """<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>__TITULO__</title>
+<style>
+  body { font-family: Arial, sans-serif; background: #f0f0f0; color: #333; margin: 0; padding: 20px; }
+  h1 { margin: 0 0 4px 0; }
+  h2 { font-size: 16px; margin: 24px 0 10px 0; }
+  .sub { color: #999; font-size: 12px; margin-bottom: 16px; }
+  .filtros { background: white; border: 1px solid #ddd; padding: 12px; display: flex; flex-wrap: wrap; gap: 12px; align-items: center; }
+  .filtros label { font-size: 13px; }
+  .filtros input[type=text] { width: 220px; }
+  .cards { display: grid; grid-template-columns: repeat(auto-fill, minmax(220px, 1fr)); gap: 12px; }
+  .card { background: white; border: 1px solid #ddd; border-top: 3px solid #3498DB; padding: 14px; text-align: center; }
+  .card:nth-child(3n+1) { border-top-color: #F39C12; }
+  .card:nth-child(3n+3) { border-top-color: #1ABC9C; }
+  .card .valor { font-size: 20px; font-weight: bold; }
+  .card .titulo { font-size: 12px; color: #666; margin-top: 6px; }
+  .graficos { display: grid; grid-template-columns: 1fr 1fr; gap: 12px; }
+  .painel { background: white; border: 1px solid #ddd; padding: 12px; }
+  .barra { display: flex; align-items: center; font-size: 12px; margin: 3px 0; }
+  .barra .nome { width: 180px; overflow: hidden; text-overflow: ellipsis; white-space: nowrap; }
+  .barra .trilho { flex: 1; }
+  .barra .preenchido { background: #4682B4; height: 14px; display: inline-block; vertical-align: middle; }
+  .barra .qtd { margin-left: 6px; }
+  table { border-collapse: collapse; background: white; font-size: 12px; }
+  th, td { border: 1px solid #ddd; padding: 4px 8px; text-align: center; }
+  th { background: #4CAF50; color: white; }
+  button { background: #4CAF50; color: white; border: 0; padding: 8px 14px; cursor: pointer; }
+  button:disabled { background: #999; }
+</style>
+</head>
+<body>
+<h1>__TITULO__</h1>
+<div class="sub" id="gerado"></div>
+
+<h2>Métricas Principais (todas as tarefas)</h2>
+<div class="cards" id="metricas"></div>
+
+<h2>Filtros</h2>
+<div class="filtros">
+  <label>Pesquisar <input type="text" id="termo" placeholder="projeto ou técnico"></label>
+  <label>Projeto <select id="projeto"></select></label>
+  <label>Técnico <select id="tecnico"></select></label>
+  <label>Início de <input type="date" id="de"></label>
+  <label>até <input type="date" id="ate"></label>
+  <span id="situacoes"></span>
+  <label id="rotulo_agrupar"><input type="checkbox" id="agrupar"> Agrupar por squad</label>
+  <button id="exportar">Exportar linhas filtradas (CSV)</button>
+</div>
+
+<h2>Resultado do filtro</h2>
+<div class="cards" id="resumo"></div>
+
+<h2>Gráficos</h2>
+<div class="graficos">
+  <div class="painel"><b>Tarefas por Projeto</b><div id="barras_projetos"></div></div>
+  <div class="painel"><b id="titulo_tecnicos">Tarefas por Técnico</b><div id="barras_tecnicos"></div></div>
+</div>
+<div class="painel" style="margin-top: 12px;"><b>Tarefas por Dia de Início</b><div id="linha_tempo"></div></div>
+
+<h2>Duração por Técnico (dias)</h2>
+<table id="duracoes"><thead><tr><th>Técnico</th><th>Tarefas</th><th>Média</th><th>Mediana</th><th>P90</th><th>P99</th></tr></thead><tbody></tbody></table>
+
+<script id="dados" type="application/json">__DADOS__</script>
+<script id="linhas" type="application/json">__LINHAS__</script>
+<script>
+"use strict";
+const DADOS = JSON.parse(document.getElementById("dados").textContent);
+const CARGA_LINHAS = JSON.parse(document.getElementById("linhas").textContent);
+const CUBO = DADOS.cubo;
+const CEL = CUBO.celulas;
+const N_CELULAS = CEL.n.length;
+const $ = (id) => document.getElementById(id);
+const esc = (t) => String(t).replace(/[&<>"]/g, (c) => ({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}[c]));
+
+$("gerado").textContent = "Gerado em " + DADOS.gerado_em + " | Equipe: " + DADOS.equipe;
+$("metricas").innerHTML = DADOS.metricas.map(([titulo, valor]) =>
+  `<div class="card"><div class="valor">${esc(valor)}</div><div class="titulo">${esc(titulo)}</div></div>`).join("");
+$("duracoes").tBodies[0].innerHTML = DADOS.duracoes.map((linha) =>
+  "<tr>" + linha.map((v) => `<td>${esc(v)}</td>`).join("") + "</tr>").join("");
+
+// Listas de seleção em ordem alfabética (ocultos: máscara opcional de itens fora da lista)
+function preencherSelecao(elemento, nomes, ocultos) {
+  const ordem = nomes.map((_, i) => i).filter((i) => !(ocultos && ocultos[i]))
+    .sort((a, b) => nomes[a].localeCompare(nomes[b]));
+  elemento.innerHTML = '<option value="-1">Todos</option>' +
+    ordem.map((i) => `<option value="${i}">${esc(nomes[i])}</option>`).join("");
+}
+preencherSelecao($("projeto"), CUBO.projetos);
+preencherSelecao($("tecnico"), CUBO.tecnicos, CUBO.excluido);
+$("agrupar").checked = DADOS.agrupar_squads;
+// Sem squads configurados só existe o grupo "Sem squad"
+if (CUBO.grupos.length <= 1) $("rotulo_agrupar").style.display = "none";
+$("situacoes").innerHTML = CUBO.situacoes.map((nome, i) =>
+  `<label><input type="checkbox" class="situacao" value="${i}" checked> ${esc(nome)}</label>`).join(" ");
+
+// Células selecionadas pelo filtro atual (usadas também na exportação das linhas)
+let selecionadas = new Uint8Array(N_CELULAS);
+
+// Máscara sobre os itens de um dicionário (cada nome é comparado uma única vez)
+function mascaraNomes(nomes, teste) {
+  const mascara = new Uint8Array(nomes.length);
+  nomes.forEach((nome, i) => { mascara[i] = teste(nome, i) ? 1 : 0; });
+  return mascara;
+}
+
+function filtrar() {
+  const termo = $("termo").value.trim().toLowerCase();
+  const projeto = Number($("projeto").value);
+  const tecnico = Number($("tecnico").value);
+  const de = $("de").value, ate = $("ate").value;
+  const situacoes = new Set([...document.querySelectorAll(".situacao:checked")].map((e) => Number(e.value)));
+
+  // Filtros avaliados nos dicionários (projetos, combinações, dias), não nas linhas
+  const tecnicosPesquisa = mascaraNomes(CUBO.tecnicos, (nome) => termo !== "" && nome.toLowerCase().includes(termo));
+  const projetoOk = mascaraNomes(CUBO.projetos, (_, i) => projeto < 0 || i === projeto);
+  const projetoPesquisa = mascaraNomes(CUBO.projetos, (nome) => termo === "" || nome.toLowerCase().includes(termo));
+  const combinacaoOk = mascaraNomes(CUBO.combinacoes, (lista) => tecnico < 0 || lista.includes(tecnico));
+  const combinacaoPesquisa = mascaraNomes(CUBO.combinacoes, (lista) => lista.some((t) => tecnicosPesquisa[t]));
+  const diaOk = mascaraNomes(CUBO.dias, (dia) => (de === "" && ate === "") ||
+    (dia !== "" && (de === "" || dia >= de) && (ate === "" || dia <= ate)));
+
+  const porProjeto = new Float64Array(CUBO.projetos.length);
+  const porTecnico = new Float64Array(CUBO.tecnicos.length);
+  const porDia = new Float64Array(CUBO.dias.length);
+  const porSituacao = new Float64Array(CUBO.situacoes.length);
+  let total = 0;
+
+  for (let i = 0; i < N_CELULAS; i++) {
+    const p = CEL.p[i], c = CEL.c[i], d = CEL.d[i], s = CEL.s[i], n = CEL.n[i];
+    const ok = projetoOk[p] && combinacaoOk[c] && diaOk[d] && situacoes.has(s) &&
+               (projetoPesquisa[p] || combinacaoPesquisa[c]);
+    selecionadas[i] = ok ? 1 : 0;
+    if (!ok) continue;
+    total += n;
+    porProjeto[p] += n;
+    porDia[d] += n;
+    porSituacao[s] += n;
+    for (const t of CUBO.combinacoes[c]) if (!CUBO.excluido[t]) porTecnico[t] += n;
+  }
+
+  $("resumo").innerHTML = [
+    ["Tarefas", total],
+    ["Projetos", porProjeto.filter((v) => v > 0).length],
+    ...CUBO.situacoes.map((nome, i) => [nome, porSituacao[i]]),
+  ].map(([titulo, valor]) =>
+    `<div class="card"><div class="valor">${valor}</div><div class="titulo">${esc(titulo)}</div></div>`).join("");
+
+  desenharBarras($("barras_projetos"), CUBO.projetos, porProjeto, "Outros projetos");
+  if ($("agrupar").checked) {
+    // Soma por squad feita sobre o dicionário de técnicos (um item por técnico, não por tarefa)
+    const porGrupo = new Float64Array(CUBO.grupos.length);
+    porTecnico.forEach((v, t) => { porGrupo[CUBO.grupo[t]] += v; });
+    $("titulo_tecnicos").textContent = "Tarefas por Squad";
+    desenharBarras($("barras_tecnicos"), CUBO.grupos, porGrupo, "Outros squads");
+  } else {
+    $("titulo_tecnicos").textContent = "Tarefas por Técnico";
+    desenharBarras($("barras_tecnicos"), CUBO.tecnicos, porTecnico, "Outros técnicos");
+  }
+  desenharLinhaTempo($("linha_tempo"), porDia);
+}
+
+// Maiores categorias + "Outros" (mesmo limite dos gráficos do aplicativo)
+function desenharBarras(elemento, nomes, valores, rotuloOutros) {
+  const ordem = [];
+  valores.forEach((v, i) => { if (v > 0) ordem.push(i); });
+  ordem.sort((a, b) => valores[b] - valores[a]);
+  const itens = ordem.slice(0, DADOS.max_categorias).map((i) => [nomes[i], valores[i]]);
+  const outros = ordem.slice(DADOS.max_categorias).reduce((soma, i) => soma + valores[i], 0);
+  if (outros > 0) itens.push([rotuloOutros, outros]);
+  const maximo = Math.max(1, ...itens.map(([, v]) => v));
+  elemento.innerHTML = itens.length ? itens.map(([nome, v]) =>
+    `<div class="barra"><span class="nome" title="${esc(nome)}">${esc(nome)}</span>` +
+    `<span class="trilho"><span class="preenchido" style="width:${(90 * v / maximo).toFixed(2)}%"></span>` +
+    `<span class="qtd">${v}</span></span></div>`).join("") : "<i>Nenhuma tarefa</i>";
+}
+
+// Linha do tempo em um único SVG (os dias já vêm em ordem; o último item é "sem data")
+function desenharLinhaTempo(elemento, porDia) {
+  const dias = CUBO.dias.filter((d) => d !== "").length;
+  if (dias === 0) { elemento.innerHTML = "<i>Sem datas</i>"; return; }
+  const largura = 1000, altura = 160;
+  const maximo = Math.max(1, ...porDia.slice(0, dias));
+  const passo = largura / Math.max(1, dias - 1);
+  const pontos = [];
+  for (let i = 0; i < dias; i++) {
+    pontos.push(`${(i * passo).toFixed(1)},${(altura - altura * porDia[i] / maximo).toFixed(1)}`);
+  }
+  elemento.innerHTML = `<svg viewBox="-5 -5 ${largura + 10} ${altura + 25}" width="100%" height="200">` +
+    `<polyline fill="none" stroke="#4682B4" stroke-width="2" points="${pontos.join(" ")}"/>` +
+    `<text x="0" y="${altura + 18}" font-size="12">${CUBO.dias[0]}</text>` +
+    `<text x="${largura}" y="${altura + 18}" font-size="12" text-anchor="end">${CUBO.dias[dias - 1]}</text>` +
+    `<text x="0" y="10" font-size="12">máx. ${maximo}</text></svg>`;
+}
+
+// Linhas das tarefas: descompactadas só quando a exportação é pedida
+let linhasPromessa = null;
+function obterLinhas() {
+  if (!linhasPromessa) {
+    if (CARGA_LINHAS.formato === "json") {
+      linhasPromessa = Promise.resolve(JSON.parse(CARGA_LINHAS.conteudo));
+    } else {
+      const bytes = Uint8Array.from(atob(CARGA_LINHAS.conteudo), (c) => c.charCodeAt(0));
+      const fluxo = new Blob([bytes]).stream().pipeThrough(new DecompressionStream(CARGA_LINHAS.formato));
+      linhasPromessa = new Response(fluxo).text().then(JSON.parse);
+    }
+  }
+  return linhasPromessa;
+}
+
+async function exportarLinhas() {
+  const linhas = await obterLinhas();
+  const celula = linhas.celula;
+  const csv = (v) => /[";\\n]/.test(v) ? '"' + v.replace(/"/g, '""') + '"' : v;
+  const partes = [linhas.colunas.map(csv).join(";")];
+  for (let r = 0; r < celula.length; r++) {
+    if (!selecionadas[celula[r]]) continue;
+    partes.push(linhas.colunas.map((col) => csv(linhas.valores[col][linhas.codigos[col][r]])).join(";"));
+  }
+  const blob = new Blob(["\\ufeff" + partes.join("\\r\\n")], {type: "text/csv;charset=utf-8"});
+  const link = document.createElement("a");
+  link.href = URL.createObjectURL(blob);
+  link.download = "tarefas_filtradas.csv";
+  link.click();
+  URL.revokeObjectURL(link.href);
+}
+
+if (CARGA_LINHAS === null) {
+  $("exportar").disabled = true;
+  $("exportar").title = "Arquivo gerado sem as linhas das tarefas";
+} else {
+  $("exportar").addEventListener("click", exportarLinhas);
+}
+
+let agendado = null;
+function agendarFiltro() {
+  clearTimeout(agendado);
+  agendado = setTimeout(filtrar, 150);
+}
+$("termo").addEventListener("input", agendarFiltro);
+for (const id of ["projeto", "tecnico", "de", "ate", "agrupar"]) $(id).addEventListener("change", filtrar);
+document.querySelectorAll(".situacao").forEach((e) => e.addEventListener("change", filtrar));
+filtrar();
+</script>
+</body>
+</html>
+"""
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+# Quantidade de categorias exibidas nos gráficos antes de agrupar o restante em "Outros"
+MAX_CATEGORIAS_GRAFICO = 12
+
+# Quantidade de barras por página no ranking completo
+BARRAS_POR_PAGINA = 25
+
+
+# Função para obter as posições das n maiores contagens, em ordem decrescente
+# argpartition separa as n maiores em O(k); só essas n são ordenadas
+def posicoes_maiores(valores, n):
+    n = min(n, len(valores))
+    if n == 0:
+        return np.array([], dtype=np.int64)
+    if n < len(valores):
+        posicoes = np.argpartition(-valores, n - 1)[:n]
+    else:
+        posicoes = np.arange(len(valores))
+    return posicoes[np.argsort(-valores[posicoes], kind="stable")]
+
+
+# Função para manter as n maiores categorias e somar o restante em uma única barra
+def top_n_com_outros(contagem, n=MAX_CATEGORIAS_GRAFICO, rotulo_outros="Outros"):
+    valores = contagem.to_numpy()
+    posicoes = posicoes_maiores(valores, n)
+    top = contagem.iloc[posicoes]
+
+    outros = valores.sum() - top.sum()
+    if len(posicoes) < len(valores) and outros > 0:
+        top = pd.concat([top, pd.Series({rotulo_outros: outros})])
+    return top
+
+
+# Função para ordenar o ranking completo (uma vez) e devolver as páginas sob demanda
+def ordenar_ranking(contagem):
+    valores = contagem.to_numpy()
+    return contagem.iloc[np.argsort(-valores, kind="stable")]
+
+
+# Função para obter uma página do ranking já ordenado (a página é limitada ao intervalo válido)
+def pagina_ranking(ranking, pagina, por_pagina=BARRAS_POR_PAGINA):
+    total_paginas = max(1, int(np.ceil(len(ranking) / por_pagina)))
+    pagina = max(0, min(pagina, total_paginas - 1))
+    return ranking.iloc[pagina * por_pagina:(pagina + 1) * por_pagina], pagina, total_paginas
+
+
+# Função para desenhar barras horizontais com os valores no final das barras
+# Os rótulos são adicionados de uma vez com bar_label (um único passo para todas as barras)
+def desenhar_barras_horizontais(ax, contagem, titulo, cor="#4682B4", fontsize=8):
+    posicoes = np.arange(len(contagem))
+    barras = ax.barh(posicoes, contagem.to_numpy(), color=cor)
+    ax.set_yticks(posicoes)
+    ax.set_yticklabels([str(nome) for nome in contagem.index], fontsize=fontsize)
+    ax.bar_label(barras, fontsize=fontsize, padding=2)
+
+    # Configurar título e labels
+    ax.set_title(titulo, fontsize=12, fontweight='bold')
+    ax.set_xlabel("Quantidade", fontsize=10)
+    ax.set_ylabel("")
+
+    # Adicionar linhas de grade horizontais para facilitar a leitura
+    ax.grid(True, axis='x', linestyle='--', alpha=0.7)
+    return barras
+
+
+# Função para desenhar barras verticais (usada no PDF) com os rótulos em lote
+def desenhar_barras_verticais(ax, contagem, titulo, fontsize=8):
+    posicoes = np.arange(len(contagem))
+    barras = ax.bar(posicoes, contagem.to_numpy())
+    ax.set_xticks(posicoes)
+    ax.set_xticklabels([str(nome) for nome in contagem.index], rotation=45, ha="right", fontsize=fontsize)
+    ax.bar_label(barras, fontsize=fontsize, padding=2)
+    ax.set_title(titulo)
+    ax.set_ylabel("Quantidade")
+    return barras
@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pandas as pd
+
+
+# Grafo de valores derivados com memoização e invalidação por versão
+# Entradas (dados, aliases, exclusões...) recebem uma nova versão a cada alteração; cada nó
+# guarda as versões das dependências usadas no último cálculo e só é recalculado quando
+# alguma delas mudou. Assim, alterar uma entrada recalcula apenas os nós abaixo dela
+class GrafoDerivados:
+    def __init__(self):
+        self._trava = threading.RLock()
+        self._funcoes = {}
+        self._valores = {}
+        self._versoes = {}
+        self._assinaturas = {}
+        self._contador = 0
+        self._estatisticas = {}
+
+    # Define (ou altera) o valor de uma entrada do grafo
+    def definir_entrada(self, nome, valor):
+        with self._trava:
+            if nome in self._funcoes:
+                raise ValueError(f"'{nome}' é um nó calculado, não uma entrada")
+            self._contador += 1
+            self._valores[nome] = valor
+            self._versoes[nome] = self._contador
+
+    # Registra um nó calculado: funcao recebe os valores das dependências, na mesma ordem
+    def registrar(self, nome, dependencias, funcao):
+        with self._trava:
+            self._funcoes[nome] = (tuple(dependencias), funcao)
+            self._assinaturas.pop(nome, None)
+            self._estatisticas[nome] = {"calculos": 0, "acertos": 0, "tempo_total": 0.0, "ultimo_tempo": 0.0}
+
+    # Retorna o valor de um nó, recalculando só se alguma dependência mudou de versão
+    def obter(self, nome):
+        with self._trava:
+            if nome not in self._funcoes:
+                if nome in self._valores:
+                    return self._valores[nome]
+                raise KeyError(f"Nó desconhecido: {nome}")
+
+            dependencias, funcao = self._funcoes[nome]
+            valores = [self.obter(dependencia) for dependencia in dependencias]
+            assinatura = tuple(self._versoes[dependencia] for dependencia in dependencias)
+
+            estatisticas = self._estatisticas[nome]
+            if self._assinaturas.get(nome) == assinatura:
+                estatisticas["acertos"] += 1
+                return self._valores[nome]
+
+            inicio = time.perf_counter()
+            valor = funcao(*valores)
+            tempo = time.perf_counter() - inicio
+
+            self._contador += 1
+            self._valores[nome] = valor
+            self._versoes[nome] = self._contador
+            self._assinaturas[nome] = assinatura
+            estatisticas["calculos"] += 1
+            estatisticas["tempo_total"] += tempo
+            estatisticas["ultimo_tempo"] = tempo
+            return valor
+
+    # Define uma entrada e retorna o valor de um nó na mesma operação (sem outra thread no meio)
+    # Usado em entradas que mudam a cada consulta, como o filtro de uma visão
+    def obter_com_entrada(self, nome, entrada, valor):
+        with self._trava:
+            self.definir_entrada(entrada, valor)
+            return self.obter(nome)
+
+    # Versão atual de uma entrada ou nó (muda sempre que o valor é alterado ou recalculado)
+    def versao(self, nome):
+        with self._trava:
+            return self._versoes.get(nome, 0)
+
+    # Tempos de cálculo e acertos de cada nó
+    def estatisticas(self):
+        with self._trava:
+            tabela = pd.DataFrame.from_dict(self._estatisticas, orient="index")
+        tabela = tabela.rename(columns={
+            "calculos": "Cálculos",
+            "acertos": "Acertos",
+            "tempo_total": "Tempo total (s)",
+            "ultimo_tempo": "Último cálculo (s)",
+        })
+        tabela.index.name = "Nó"
+        return tabela.sort_values("Tempo total (s)", ascending=False)
@@ -0,0 +1,87 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from processamento_disco import COLUNAS_NECESSARIAS, COLUNAS_DATA
+
+# Colunas adicionadas ao resultado para indicar a origem de cada linha
+COLUNA_ARQUIVO = "Arquivo"
+COLUNA_ABA = "Aba"
+
+
+# Função para listar as abas de uma planilha que têm todas as colunas necessárias
+# Só a primeira linha de cada aba é lida (modo somente leitura do openpyxl)
+# Retorna pares (nome da aba, quantidade estimada de linhas)
+def listar_abas_compativeis(caminho, todas_abas=True):
+    livro = load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        planilhas = livro.worksheets if todas_abas else livro.worksheets[:1]
+        abas = []
+        for planilha in planilhas:
+            cabecalho = next(planilha.iter_rows(max_row=1, values_only=True), ())
+            cabecalho = [str(valor) for valor in cabecalho if valor is not None]
+            if all(col in cabecalho for col in COLUNAS_NECESSARIAS):
+                abas.append((planilha.title, planilha.max_row or 0))
+        return abas
+    finally:
+        livro.close()
+
+
+# Função executada em cada processo: lê uma aba inteira
+def ler_aba(caminho, aba):
+    return pd.read_excel(caminho, sheet_name=aba, parse_dates=COLUNAS_DATA)
+
+
+# Função para montar a coluna de origem como categoria (um código inteiro por linha,
+# sem criar um texto por linha)
+def _coluna_origem(nomes, tamanhos):
+    codigos_partes, categorias = pd.factorize(pd.Index(nomes))
+    codigos = np.repeat(codigos_partes, tamanhos)
+    return pd.Categorical.from_codes(codigos, categories=categorias)
+
+
+# Função para carregar várias abas de várias planilhas, cada aba em um processo
+# As abas maiores são enviadas primeiro para equilibrar a carga entre os processos;
+# o resultado mantém a ordem original (arquivo, aba) e ganha as colunas "Arquivo" e "Aba"
+def carregar_abas_em_paralelo(caminhos, todas_abas=True, max_processos=None):
+    tarefas = []
+    for caminho in caminhos:
+        for aba, linhas_estimadas in listar_abas_compativeis(caminho, todas_abas):
+            tarefas.append((caminho, aba, linhas_estimadas))
+
+    if not tarefas:
+        return None
+
+    if max_processos is None:
+        max_processos = os.cpu_count() or 1
+    max_processos = max(1, min(max_processos, len(tarefas)))
+
+    partes = [None] * len(tarefas)
+    if max_processos == 1:
+        # Uma única aba (ou um único núcleo): ler no próprio processo, sem custo de iniciar outro
+        for i, (caminho, aba, _) in enumerate(tarefas):
+            partes[i] = ler_aba(caminho, aba)
+    else:
+        # "spawn" evita copiar o processo da interface (Tk) para os processos de leitura
+        contexto = multiprocessing.get_context("spawn")
+        ordem = sorted(range(len(tarefas)), key=lambda i: tarefas[i][2], reverse=True)
+        with ProcessPoolExecutor(max_workers=max_processos, mp_context=contexto) as executor:
+            futuros = {i: executor.submit(ler_aba, tarefas[i][0], tarefas[i][1]) for i in ordem}
+            for i, futuro in futuros.items():
+                partes[i] = futuro.result()
+
+    tamanhos = [len(parte) for parte in partes]
+    nomes_arquivos = [os.path.basename(caminho) for caminho, _, _ in tarefas]
+    nomes_abas = [aba for _, aba, _ in tarefas]
+
+    # Uma única cópia na concatenação; as partes são liberadas em seguida
+    df = pd.concat(partes, ignore_index=True, copy=False)
+    del partes
+
+    df[COLUNA_ARQUIVO] = _coluna_origem(nomes_arquivos, tamanhos)
+    df[COLUNA_ABA] = _coluna_origem(nomes_abas, tamanhos)
+    return df
@@ -1,73 +1,43 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
+from tkinter import filedialog, messagebox, simpledialog, ttk
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
-import datetime
 import os
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
-import io
 import numpy as np
+from validacao import linhas_com_erros
+from processamento_disco import agregar_planilha_em_disco, finalizar_agregados, LIMITE_MEMORIA_MB
+from conjunto_dados import ConjuntoDados
+from comparacao import comparar_planilhas, DUPLICADOS_ANTERIOR, DUPLICADOS_NOVA
+from carga_tecnicos import desenhar_mapa_carga, tarefas_abertas
+from camada_exibicao import construir_exibicao
+from ordenacao import ordenar_linhas
+from graficos_categorias import (top_n_com_outros, ordenar_ranking, pagina_ranking,
+                                 desenhar_barras_horizontais, MAX_CATEGORIAS_GRAFICO)
+from duracoes import formatar_dias, desenhar_histograma, DIAS_A_VENCER
+from leitura_paralela import carregar_abas_em_paralelo
+from exportacao_html import gerar_html
+from config_tecnicos import (carregar_config, aplicar_em_contagem, aplicar_em_carga,
+                             aplicar_em_tabela, config_padrao)
+from trabalhadores import (exportar_pdf_em_trabalhadores, exportar_excel_em_trabalhadores,
+                           executar_em_segundo_plano, encerrar_pools)
 
-# Função para normalizar nomes de técnicos
-def normalizar_nome(nome):
-    if pd.isna(nome) or nome == "":
-        return "Sem Técnico"
-    
-    # Remover espaços extras e converter para minúsculas para padronização
-    nome = nome.strip().lower()
-    
-    # Capitalizar cada palavra para apresentação
-    nome = ' '.join(word.capitalize() for word in nome.split())
-    
-    return nome
-
-# Função para dividir nomes compostos separados por vírgula
-def dividir_nomes_tecnicos(df):
-    # Criar uma cópia do dataframe para não modificar o original
-    df_expandido = df.copy()
-    
-    # Verificar se a coluna Técnico existe
-    if "Técnico" not in df_expandido.columns:
-        return df_expandido
-    
-    # Normalizar todos os nomes de técnicos
-    df_expandido["Técnico"] = df_expandido["Técnico"].apply(normalizar_nome)
-    
-    # Criar um novo dataframe para armazenar as linhas expandidas
-    linhas_expandidas = []
-    
-    # Processar cada linha do dataframe
-    for _, row in df_expandido.iterrows():
-        tecnico = row["Técnico"]
-        
-        # Verificar se o nome contém vírgula (múltiplos técnicos)
-        if "," in tecnico:
-            # Dividir os nomes e criar uma linha para cada técnico
-            for nome in tecnico.split(","):
-                nome_normalizado = normalizar_nome(nome)
-                nova_linha = row.copy()
-                nova_linha["Técnico"] = nome_normalizado
-                linhas_expandidas.append(nova_linha)
-        else:
-            # Manter a linha original
-            linhas_expandidas.append(row)
-    
-    # Criar um novo dataframe com as linhas expandidas
-    return pd.DataFrame(linhas_expandidas)
+# Configurar cores e estilos
+cor_fundo = "#f0f0f0"
+cor_destaque = "#4CAF50"
+cor_texto = "#333333"
+cor_texto_claro = "white"
 
-def selecionar_arquivo():
+# Função para escolher e validar uma planilha; retorna o dataframe ou None
+def carregar_planilha(titulo="Selecione a planilha"):
     caminho_arquivo = filedialog.askopenfilename(
         filetypes=[("Planilhas Excel", "*.xlsx")],
-        title="Selecione a planilha"
+        title=titulo
     )
 
     if not caminho_arquivo:
-        return
+        return None
 
     try:
         # Usar parse_dates para converter automaticamente colunas de data
@@ -81,14 +51,289 @@ def selecionar_arquivo():
         
         if colunas_faltantes:
             messagebox.showerror("Erro", f"A planilha não contém as seguintes colunas: {', '.join(colunas_faltantes)}")
-            return
+            return None
         
+        return df
+
+    except Exception as e:
+        messagebox.showerror("Erro ao processar", str(e))
+        return None
+
+def selecionar_arquivo():
+    df = carregar_planilha()
+    
+    if df is not None:
         # Exibir o dashboard
         exibir_dashboard(df)
 
+# Função para abrir várias planilhas (e todas as abas compatíveis) de uma vez
+# Cada aba é lida em um processo separado; as linhas ganham as colunas "Arquivo" e "Aba"
+def selecionar_varias_planilhas():
+    caminhos = filedialog.askopenfilenames(
+        filetypes=[("Planilhas Excel", "*.xlsx")],
+        title="Selecione uma ou mais planilhas"
+    )
+    
+    if not caminhos:
+        return
+    
+    todas_abas = messagebox.askyesno(
+        "Abas",
+        "Carregar todas as abas que contêm as colunas necessárias?\n\n"
+        "Escolha \"Não\" para carregar apenas a primeira aba de cada planilha."
+    )
+    
+    try:
+        df = carregar_abas_em_paralelo(caminhos, todas_abas=todas_abas)
+    except Exception as e:
+        messagebox.showerror("Erro ao processar", str(e))
+        return
+    
+    if df is None:
+        messagebox.showerror("Erro", "Nenhuma aba contém todas as colunas necessárias.")
+        return
+    
+    exibir_dashboard(df)
+
+# Função para comparar duas exportações da mesma planilha
+def selecionar_comparacao():
+    df_anterior = carregar_planilha("Selecione a planilha ANTERIOR")
+    if df_anterior is None:
+        return
+    
+    df_nova = carregar_planilha("Selecione a planilha NOVA")
+    if df_nova is None:
+        return
+    
+    try:
+        resultado = comparar_planilhas(df_anterior, df_nova)
+        exibir_comparacao(resultado)
+    except Exception as e:
+        messagebox.showerror("Erro ao comparar", str(e))
+
+def exibir_comparacao(resultado, limite_linhas=1000):
+    # Criar uma nova janela para o resultado da comparação
+    janela_comparacao = tk.Toplevel()
+    janela_comparacao.title("Comparação de Planilhas")
+    janela_comparacao.geometry("1200x700")
+    janela_comparacao.configure(bg=cor_fundo)
+    
+    notebook = ttk.Notebook(janela_comparacao)
+    notebook.pack(fill="both", expand=True, padx=15, pady=15)
+    
+    # Aba 1: Resumo das mudanças
+    tab_resumo = ttk.Frame(notebook)
+    notebook.add(tab_resumo, text="Resumo")
+    
+    # Aba 2: Lista de diferenças
+    tab_diferencas = ttk.Frame(notebook)
+    notebook.add(tab_diferencas, text="Diferenças")
+    
+    frame_resumo = tk.Frame(tab_resumo, bg=cor_fundo)
+    frame_resumo.pack(fill="both", expand=True, padx=20, pady=20)
+    
+    tk.Label(frame_resumo, text="Resumo da Comparação", 
+            font=("Arial", 16, "bold"), bg=cor_fundo, fg=cor_texto).pack(pady=10)
+    
+    duplicados = (DUPLICADOS_ANTERIOR, DUPLICADOS_NOVA)
+    for situacao, quantidade in resultado["resumo"].items():
+        if situacao in duplicados:
+            continue
+        tk.Label(frame_resumo, text=f"Tarefas - {situacao}: {quantidade}", 
+                font=("Arial", 12), bg=cor_fundo).pack(anchor="w", padx=10, pady=2)
+    
+    # IDs repetidos: só a primeira ocorrência de cada ID entra na comparação
+    for chave in duplicados:
+        quantidade = resultado["resumo"][chave]
+        texto = f"{chave}: {quantidade}"
+        if quantidade > 0:
+            texto += " (só a primeira ocorrência de cada ID foi comparada)"
+        tk.Label(frame_resumo, text=texto, font=("Arial", 12), bg=cor_fundo,
+                fg="#E74C3C" if quantidade > 0 else "#666666").pack(anchor="w", padx=10, pady=2)
+    
+    tk.Label(frame_resumo, text="Alterações por coluna", 
+            font=("Arial", 12, "bold"), bg=cor_fundo).pack(anchor="w", padx=10, pady=(15, 5))
+    
+    for coluna, quantidade in resultado["alteracoes_por_coluna"].items():
+        tk.Label(frame_resumo, text=f"{coluna}: {quantidade}", 
+                font=("Arial", 11), bg=cor_fundo).pack(anchor="w", padx=20, pady=1)
+    
+    # Tabela de diferenças
+    df_diferencas = resultado["diferencas"]
+    colunas = list(df_diferencas.columns)
+    
+    frame_tabela = tk.Frame(tab_diferencas)
+    frame_tabela.pack(fill="both", expand=True, padx=15, pady=10)
+    
+    scrollbar_y = tk.Scrollbar(frame_tabela)
+    scrollbar_y.pack(side="right", fill="y")
+    
+    scrollbar_x = tk.Scrollbar(frame_tabela, orient="horizontal")
+    scrollbar_x.pack(side="bottom", fill="x")
+    
+    tree = ttk.Treeview(frame_tabela, columns=colunas, show="headings",
+                        yscrollcommand=scrollbar_y.set,
+                        xscrollcommand=scrollbar_x.set)
+    
+    scrollbar_y.config(command=tree.yview)
+    scrollbar_x.config(command=tree.xview)
+    
+    for col in colunas:
+        tree.heading(col, text=col)
+        tree.column(col, width=140, anchor="center")
+    
+    # Inserir no máximo limite_linhas linhas para manter a janela responsiva
+    exibicao = construir_exibicao(df_diferencas.head(limite_linhas), colunas)
+    for valores in exibicao.to_numpy().tolist():
+        tree.insert("", "end", values=valores)
+    
+    tree.pack(fill="both", expand=True)
+    
+    frame_botoes = tk.Frame(tab_diferencas, bg=cor_fundo)
+    frame_botoes.pack(fill="x", padx=15, pady=10)
+    
+    texto_total = f"Total de diferenças: {len(df_diferencas)}"
+    if len(df_diferencas) > limite_linhas:
+        texto_total += f" (exibindo as primeiras {limite_linhas})"
+    tk.Label(frame_botoes, text=texto_total, 
+            font=("Arial", 11), bg=cor_fundo).pack(side="left", padx=10)
+    
+    btn_exportar = tk.Button(frame_botoes, text="Exportar Diferenças", 
+                            command=lambda: exportar_excel(df_diferencas, "diferencas"),
+                            font=("Arial", 11), bg=cor_destaque, fg="white",
+                            padx=15, pady=5, borderwidth=0)
+    btn_exportar.pack(side="right", padx=10)
+
+# Função para carregar a configuração dos técnicos (exclusões e squads); com o arquivo inválido usa a padrão
+def carregar_config_tecnicos():
+    try:
+        return carregar_config()
+    except ValueError as e:
+        messagebox.showwarning("Configuração dos técnicos", f"{e}\nUsando a configuração padrão.")
+        return config_padrao()
+
+# Função para abrir planilhas maiores que a memória disponível (modo em disco)
+# O limite de memória define o tamanho dos blocos; mudar o limite refaz a conversão
+def selecionar_arquivo_em_disco(limite_memoria_mb=LIMITE_MEMORIA_MB):
+    caminho_arquivo = filedialog.askopenfilename(
+        filetypes=[("Planilhas Excel", "*.xlsx")],
+        title="Selecione a planilha grande"
+    )
+
+    if not caminho_arquivo:
+        return
+
+    limite_memoria_mb = simpledialog.askinteger(
+        "Limite de memória",
+        "Memória máxima por bloco (MB):",
+        initialvalue=limite_memoria_mb,
+        minvalue=16
+    )
+
+    if limite_memoria_mb is None:
+        return
+
+    try:
+        # Converter em blocos no disco (apenas na primeira vez) e agregar bloco a bloco
+        agregados = agregar_planilha_em_disco(caminho_arquivo, limite_memoria_mb=limite_memoria_mb)
+        exibir_resumo_em_disco(agregados, caminho_arquivo, carregar_config_tecnicos())
+
     except Exception as e:
         messagebox.showerror("Erro ao processar", str(e))
 
+# Os agregados são finalizados com a configuração dos técnicos; trocar a equipe ou o
+# agrupamento por squad refaz só o ranking de técnicos, sem reler os blocos
+def exibir_resumo_em_disco(agregados, caminho_arquivo, config):
+    resultado = finalizar_agregados(agregados, config=config)
+    
+    # Criar uma nova janela com o resumo das métricas agregadas
+    janela_resumo = tk.Toplevel()
+    janela_resumo.title("Resumo (modo em disco)")
+    janela_resumo.geometry("900x600")
+    janela_resumo.configure(bg=cor_fundo)
+    
+    frame = tk.Frame(janela_resumo, bg=cor_fundo)
+    frame.pack(fill="both", expand=True, padx=20, pady=20)
+    
+    tk.Label(frame, text="Métricas Principais", 
+            font=("Arial", 18, "bold"), bg=cor_fundo, fg=cor_texto).pack(pady=10)
+    tk.Label(frame, text=os.path.basename(caminho_arquivo), 
+            font=("Arial", 10), bg=cor_fundo, fg="#666666").pack()
+    
+    # Formatar o dia com mais tarefas
+    dia = resultado["dia_mais_tarefas"]
+    dia_formatado = dia.strftime("%d/%m/%Y") if hasattr(dia, "strftime") else "N/A"
+    
+    metricas = [
+        ("Total de Tarefas", resultado["total_tarefas"]),
+        ("Total de Projetos", resultado["total_projetos"]),
+        ("Dia com Mais Tarefas", f"{dia_formatado} ({resultado['qtd_tarefas_dia']} tarefas)"),
+        ("Média de Dias por Tarefa", resultado["media_dias"]),
+        ("Mediana / P90 de Dias", f"{resultado['mediana_dias']} / {resultado['p90_dias']}"),
+    ]
+    
+    frame_metricas = tk.Frame(frame, bg="white", relief=tk.SOLID, borderwidth=1)
+    frame_metricas.pack(fill="x", pady=10)
+    for titulo, valor in metricas:
+        linha = tk.Frame(frame_metricas, bg="white")
+        linha.pack(fill="x", padx=10, pady=3)
+        tk.Label(linha, text=titulo, font=("Arial", 11), bg="white", fg="#666666").pack(side="left")
+        tk.Label(linha, text=str(valor), font=("Arial", 11, "bold"), bg="white", fg=cor_texto).pack(side="right")
+    
+    # Equipe e agrupamento por squad usados no ranking de técnicos
+    frame_config = tk.Frame(frame, bg=cor_fundo)
+    frame_config.pack(fill="x", pady=5)
+    
+    tk.Label(frame_config, text="Equipe:", font=("Arial", 11), bg=cor_fundo).pack(side="left", padx=5)
+    combo_equipe = ttk.Combobox(frame_config, values=list(config["equipes"]), state="readonly", width=18)
+    combo_equipe.set(resultado["equipe"])
+    combo_equipe.pack(side="left", padx=5)
+    
+    var_agrupar = tk.BooleanVar(value=False)
+    
+    # Tabelas com os maiores projetos e técnicos
+    frame_rankings = tk.Frame(frame, bg=cor_fundo)
+    frame_rankings.pack(fill="both", expand=True, pady=10)
+    
+    arvores = {}
+    for chave, titulo in (("top_projetos", "Projetos com Mais Tarefas"),
+                          ("top_tecnicos", "Técnicos com Mais Tarefas")):
+        frame_ranking = tk.Frame(frame_rankings, bg=cor_fundo)
+        frame_ranking.pack(side="left", fill="both", expand=True, padx=10)
+        
+        tk.Label(frame_ranking, text=titulo, font=("Arial", 12, "bold"), bg=cor_fundo).pack(pady=5)
+        
+        tree = ttk.Treeview(frame_ranking, columns=["Nome", "Tarefas"], show="headings", height=10)
+        tree.heading("Nome", text="Nome")
+        tree.heading("Tarefas", text="Tarefas")
+        tree.column("Nome", width=250, anchor="w")
+        tree.column("Tarefas", width=80, anchor="center")
+        tree.pack(fill="both", expand=True)
+        arvores[chave] = tree
+    
+    def preencher_rankings():
+        for chave, tree in arvores.items():
+            tree.delete(*tree.get_children())
+            for nome, quantidade in resultado[chave].items():
+                tree.insert("", "end", values=[nome, int(quantidade)])
+    
+    def atualizar_ranking_tecnicos(event=None):
+        nonlocal resultado
+        resultado = finalizar_agregados(agregados, config=config, equipe=combo_equipe.get(),
+                                        agrupar_squads=var_agrupar.get())
+        preencher_rankings()
+    
+    combo_equipe.bind("<<ComboboxSelected>>", atualizar_ranking_tecnicos)
+    tk.Checkbutton(frame_config, text="Agrupar por squad", variable=var_agrupar, command=atualizar_ranking_tecnicos,
+                   font=("Arial", 11), bg=cor_fundo).pack(side="left", padx=5)
+    
+    preencher_rankings()
+    
+    btn_fechar = tk.Button(frame, text="Voltar", command=janela_resumo.destroy,
+                         font=("Arial", 11), bg="#999", fg="white",
+                         padx=15, pady=8, borderwidth=0)
+    btn_fechar.pack(side="left", pady=10)
+
 def exibir_dashboard(df):
     # Criar uma nova janela para o dashboard
     janela_dashboard = tk.Toplevel()
@@ -147,12 +392,27 @@ def exibir_dashboard(df):
     # tab_intercorrencias = ttk.Frame(notebook)
     # notebook.add(tab_intercorrencias, text="Intercorrências")
     
-    # Configurar as abas
-    configurar_aba_dados(tab_dados, df)
-    configurar_aba_graficos(tab_graficos, df)
-    configurar_aba_metricas(tab_metricas, df)
+    # Conjunto de dados compartilhado pelas abas (guarda as visões já calculadas em cache)
+    dados = ConjuntoDados(df, config=carregar_config_tecnicos())
+    
+    # Liberar a memória compartilhada ao fechar o dashboard (exportações pendentes mantêm o bloco até terminarem)
+    janela_dashboard.bind("<Destroy>", lambda event: dados.liberar() if event.widget is janela_dashboard else None)
+    
+    # Configurar as abas (os gráficos são atualizados a partir da pesquisa na aba de dados)
+    atualizar_graficos = configurar_aba_graficos(tab_graficos, dados)
+    reaplicar_pesquisa = configurar_aba_dados(tab_dados, dados, atualizar_graficos)
+    configurar_aba_metricas(tab_metricas, dados)
+    
+    # Ao voltar para a aba de Métricas em outro dia, refazer os prazos (vencidas / a vencer)
+    def ao_trocar_aba(event=None):
+        if notebook.select() == str(tab_metricas) and dados.atualizar_hoje():
+            for widget in tab_metricas.winfo_children():
+                widget.destroy()
+            configurar_aba_metricas(tab_metricas, dados)
+    
+    notebook.bind("<<NotebookTabChanged>>", ao_trocar_aba)
     # Remover a chamada para configurar_aba_intercorrencias
-    # configurar_aba_intercorrencias(tab_intercorrencias, df)
+    # configurar_aba_intercorrencias(tab_intercorrencias, dados)
     
     # Frame para botões de ação
     frame_acoes = tk.Frame(janela_dashboard, bg=cor_fundo, height=60)
@@ -160,18 +420,107 @@ def exibir_dashboard(df):
     
     # Botões para exportar
     btn_exportar_pdf = tk.Button(frame_acoes, text="Exportar para PDF", 
-                               command=lambda: exportar_pdf(df),
+                               command=lambda: exportar_pdf(dados, janela_dashboard),
                                font=("Arial", 11), bg=cor_destaque, fg="white",
                                padx=15, pady=8, borderwidth=0)
     btn_exportar_pdf.pack(side="right", padx=10)
     
+    btn_exportar_html = tk.Button(frame_acoes, text="Exportar para HTML", 
+                                command=lambda: exportar_html(dados),
+                                font=("Arial", 11), bg=cor_destaque, fg="white",
+                                padx=15, pady=8, borderwidth=0)
+    btn_exportar_html.pack(side="right", padx=10)
+    
+    btn_estatisticas = tk.Button(frame_acoes, text="Estatísticas de Cálculo", 
+                                 command=lambda: exibir_estatisticas_calculo(dados),
+                                 font=("Arial", 11), bg="#999", fg="white",
+                                 padx=15, pady=8, borderwidth=0)
+    btn_estatisticas.pack(side="right", padx=10)
+    
     btn_voltar = tk.Button(frame_acoes, text="Voltar", 
                          command=janela_dashboard.destroy,
                          font=("Arial", 11), bg="#999", fg="white",
                          padx=15, pady=8, borderwidth=0)
     btn_voltar.pack(side="left", padx=10)
     
-def configurar_aba_dados(tab, df):
+    # Configuração dos técnicos: equipe ativa, agrupamento por squad e recarga do arquivo
+    # Só as entradas do grafo mudam; os dados não são recarregados
+    def atualizar_abas_tecnicos():
+        # Gráficos da pesquisa atual e aba de Métricas refeitos com as novas máscaras
+        reaplicar_pesquisa()
+        for widget in tab_metricas.winfo_children():
+            widget.destroy()
+        configurar_aba_metricas(tab_metricas, dados)
+    
+    def mudar_equipe(event=None):
+        dados.definir_equipe(combo_equipe.get())
+        atualizar_abas_tecnicos()
+    
+    def mudar_agrupamento():
+        dados.agrupar_squads = var_agrupar.get()
+        atualizar_abas_tecnicos()
+    
+    def recarregar_config():
+        try:
+            config = carregar_config()
+        except Exception as e:
+            messagebox.showerror("Erro ao carregar configuração", str(e))
+            return
+        dados.definir_config(config, combo_equipe.get())
+        combo_equipe.config(values=list(config["equipes"]))
+        combo_equipe.set(dados.grafo.obter("equipe"))
+        atualizar_abas_tecnicos()
+    
+    tk.Label(frame_acoes, text="Equipe:", font=("Arial", 11), bg=cor_fundo).pack(side="left", padx=(20, 5))
+    combo_equipe = ttk.Combobox(frame_acoes, values=list(dados.grafo.obter("config")["equipes"]),
+                                state="readonly", width=18)
+    combo_equipe.set(dados.grafo.obter("equipe"))
+    combo_equipe.bind("<<ComboboxSelected>>", mudar_equipe)
+    combo_equipe.pack(side="left", padx=5)
+    
+    var_agrupar = tk.BooleanVar(value=dados.agrupar_squads)
+    tk.Checkbutton(frame_acoes, text="Agrupar por squad", variable=var_agrupar, command=mudar_agrupamento,
+                   font=("Arial", 11), bg=cor_fundo).pack(side="left", padx=5)
+    
+    btn_recarregar_config = tk.Button(frame_acoes, text="Recarregar Configuração", 
+                                      command=recarregar_config,
+                                      font=("Arial", 11), bg="#999", fg="white",
+                                      padx=15, pady=8, borderwidth=0)
+    btn_recarregar_config.pack(side="left", padx=10)
+    
+# Janela com os tempos de cálculo e acertos de cada valor derivado e do cache de visões
+def exibir_estatisticas_calculo(dados):
+    janela_estatisticas = tk.Toplevel()
+    janela_estatisticas.title("Estatísticas de Cálculo")
+    janela_estatisticas.geometry("700x500")
+    janela_estatisticas.configure(bg=cor_fundo)
+    
+    frame = tk.Frame(janela_estatisticas, bg=cor_fundo)
+    frame.pack(fill="both", expand=True, padx=15, pady=15)
+    
+    tk.Label(frame, text="Valores Derivados", 
+            font=("Arial", 14, "bold"), bg=cor_fundo).pack(pady=10)
+    
+    colunas = ["Nó", "Cálculos", "Acertos", "Tempo total (s)", "Último cálculo (s)"]
+    tree = ttk.Treeview(frame, columns=colunas, show="headings", height=15)
+    for col in colunas:
+        tree.heading(col, text=col)
+        tree.column(col, width=180 if col == "Nó" else 110, anchor="center")
+    
+    for no, linha in dados.grafo.estatisticas().iterrows():
+        tree.insert("", "end", values=[no, int(linha["Cálculos"]), int(linha["Acertos"]),
+                                       f"{linha['Tempo total (s)']:.4f}", f"{linha['Último cálculo (s)']:.4f}"])
+    
+    tree.pack(fill="both", expand=True)
+    
+    cache = dados.cache.estatisticas()
+    tk.Label(frame, text=f"Cache de visões: {cache['itens']} itens | {cache['acertos']} acertos | "
+                         f"{cache['falhas']} falhas | {cache['bytes_usados'] / 1024 / 1024:.1f} MB", 
+            font=("Arial", 10), bg=cor_fundo).pack(pady=10)
+
+def configurar_aba_dados(tab, dados, atualizar_graficos=None):
+    df = dados.df
+    
     # Criar um frame com scrollbar
     frame = tk.Frame(tab, bg=cor_fundo)
     frame.pack(fill="both", expand=True, padx=15, pady=15)
@@ -185,30 +534,18 @@ def configurar_aba_dados(tab, df):
     entrada_pesquisa.pack(side="left", padx=5)
     
     def pesquisar():
-        termo = entrada_pesquisa.get().lower()
-        for item in tree.get_children():
-            tree.delete(item)
-            
-        for _, row in df.iterrows():
-            valores = []
-            encontrado = False
-            
-            for col in colunas:
-                if col in df.columns:
-                    valor = row[col]
-                    # Formatar datas
-                    if isinstance(valor, (datetime.datetime, pd.Timestamp)):
-                        valor = valor.strftime("%d/%m/%Y")
-                    valor_str = str(valor) if not pd.isna(valor) else ""
-                    valores.append(valor_str)
-                    
-                    if termo in valor_str.lower():
-                        encontrado = True
-                else:
-                    valores.append("")
-            
-            if encontrado or termo == "":
-                tree.insert("", "end", values=valores)
+        # Obter a visão da pesquisa (reaproveitada do cache quando já foi calculada)
+        visao = dados.obter_visao(entrada_pesquisa.get())
+        
+        # Guardar as linhas encontradas e reaplicar a ordenação atual sobre elas
+        estado["linhas"] = visao["linhas"] if visao["total"] < len(df) else None
+        atualizar_ordem()
+        
+        label_total.config(text=f"Total de registros: {visao['total']}")
+        
+        # Atualizar os gráficos com os dados da mesma visão
+        if atualizar_graficos:
+            atualizar_graficos(visao)
     
     btn_pesquisar = tk.Button(frame_pesquisa, text="Buscar", command=pesquisar,
                             font=("Arial", 10), bg=cor_destaque, fg="white",
@@ -250,17 +587,96 @@ def configurar_aba_dados(tab, df):
     colunas = ["ID tarefa", "URL tarefa", "Projeto", "Atividade", 
                "Data Início", "Data Vencimento", "Técnico"]
     
+    # A tabela mostra apenas as linhas visíveis (renderização em janela);
+    # a barra vertical controla a posição da janela dentro da ordem atual
     tree = ttk.Treeview(frame_tabela, columns=colunas, show="headings",
-                        yscrollcommand=scrollbar_y.set,
                         xscrollcommand=scrollbar_x.set)
     
     # Configurar as scrollbars
-    scrollbar_y.config(command=tree.yview)
     scrollbar_x.config(command=tree.xview)
     
+    # Estado da tabela: linhas da pesquisa (None = todas), ordem exibida e posição da janela
+    estado = {"linhas": None, "ordem": np.arange(len(df)), "inicio": 0,
+              "coluna": None, "crescente": True}
+    
+    # Textos formatados uma única vez na camada de exibição
+    matriz_exibicao = dados.exibicao.to_numpy()
+    
+    def linhas_visiveis():
+        altura = tree.winfo_height()
+        if altura <= 1:
+            return 30
+        # Descontar a linha do cabeçalho
+        return max(1, altura // 25 - 1)
+    
+    # Inserir somente as linhas que cabem na tabela
+    def renderizar(event=None):
+        total = len(estado["ordem"])
+        visiveis = linhas_visiveis()
+        estado["inicio"] = max(0, min(estado["inicio"], total - visiveis))
+        inicio = estado["inicio"]
+        
+        tree.delete(*tree.get_children())
+        for valores in matriz_exibicao[estado["ordem"][inicio:inicio + visiveis]].tolist():
+            tree.insert("", "end", values=valores)
+        
+        if total:
+            scrollbar_y.set(inicio / total, min(1.0, (inicio + visiveis) / total))
+        else:
+            scrollbar_y.set(0, 1)
+    
+    # Comandos da barra de rolagem ("moveto" ao arrastar, "scroll" nas setas e na roda do mouse)
+    def rolar(*args):
+        if args[0] == "moveto":
+            estado["inicio"] = int(float(args[1]) * len(estado["ordem"]))
+        elif args[0] == "scroll":
+            passo = linhas_visiveis() if args[2] == "pages" else 1
+            estado["inicio"] += int(args[1]) * passo
+        renderizar()
+    
+    scrollbar_y.config(command=rolar)
+    
+    def rolar_mouse(event):
+        if event.num == 4 or event.delta > 0:
+            rolar("scroll", -3, "units")
+        else:
+            rolar("scroll", 3, "units")
+        return "break"
+    
+    tree.bind("<MouseWheel>", rolar_mouse)
+    tree.bind("<Button-4>", rolar_mouse)
+    tree.bind("<Button-5>", rolar_mouse)
+    tree.bind("<Configure>", renderizar)
+    
+    # Recalcular a ordem exibida a partir da permutação em cache da coluna escolhida
+    def atualizar_ordem():
+        if estado["coluna"] is None:
+            estado["ordem"] = estado["linhas"] if estado["linhas"] is not None else np.arange(len(df))
+        else:
+            permutacao, total_validos = dados.permutacao(estado["coluna"])
+            estado["ordem"] = ordenar_linhas(permutacao, total_validos, estado["linhas"], estado["crescente"])
+        estado["inicio"] = 0
+        renderizar()
+    
+    # Clique no cabeçalho: ordena pela coluna; um novo clique inverte a direção
+    def ordenar(coluna):
+        if estado["coluna"] == coluna:
+            estado["crescente"] = not estado["crescente"]
+        else:
+            estado["coluna"] = coluna
+            estado["crescente"] = True
+        
+        for col in colunas:
+            seta = ""
+            if col == coluna:
+                seta = " ▲" if estado["crescente"] else " ▼"
+            tree.heading(col, text=col + seta)
+        
+        atualizar_ordem()
+    
     # Configurar cabeçalhos e colunas
     for col in colunas:
-        tree.heading(col, text=col)
+        tree.heading(col, text=col, command=lambda c=col: ordenar(c))
         tree.column(col, width=120, anchor="center")
     
     # Função para abrir URL quando clicada
@@ -274,26 +690,8 @@ def configurar_aba_dados(tab, df):
     # Vincular evento de clique duplo à função de abrir URL
     tree.bind("<Double-1>", abrir_url)
     
-    # Inserir dados
-    for _, row in df.iterrows():
-        valores = []
-        for col in colunas:
-            if col in df.columns:
-                valor = row[col]
-                # Formatar datas
-                if isinstance(valor, (datetime.datetime, pd.Timestamp)):
-                    valor = valor.strftime("%d/%m/%Y")
-                # Formatar URL da tarefa para incluir o domínio completo
-                if col == "URL tarefa" and not pd.isna(valor) and valor != "":
-                    # Verificar se a URL já tem o protocolo (http:// ou https://)
-                    if not valor.startswith(("http://", "https://")):
-                        # Se não tiver, adicionar https://
-                        valor = "https://" + valor
-                valores.append(str(valor) if not pd.isna(valor) else "")
-            else:
-                valores.append("")
-        
-        tree.insert("", "end", values=valores)
+    # Inserir as primeiras linhas
+    renderizar()
     
     # Configurar estilo para links
     tree.tag_configure("link", foreground="blue")
@@ -317,16 +715,20 @@ def configurar_aba_dados(tab, df):
     
     # Botão para exportar para Excel
     btn_exportar = tk.Button(frame_botoes, text="Exportar para Excel", 
-                            command=lambda: exportar_excel(df[colunas]),
+                            command=lambda: exportar_excel_dados(dados, colunas, tab),
                             font=("Arial", 11), bg=cor_destaque, fg="white",
                             padx=15, pady=5, borderwidth=0)
     btn_exportar.pack(side="right", padx=10)
     
     # Contador de registros
-    tk.Label(frame_botoes, text=f"Total de registros: {len(df)}", 
-            font=("Arial", 11), bg=cor_fundo).pack(side="left", padx=10)
+    label_total = tk.Label(frame_botoes, text=f"Total de registros: {len(df)}", 
+            font=("Arial", 11), bg=cor_fundo)
+    label_total.pack(side="left", padx=10)
+    
+    # A pesquisa atual pode ser reaplicada de fora (ex.: ao mudar a configuração dos técnicos)
+    return pesquisar
 
-def configurar_aba_graficos(tab, df):
+def configurar_aba_graficos(tab, dados):
     # Criar frame para os gráficos
     frame = tk.Frame(tab, bg=cor_fundo)
     frame.pack(fill="both", expand=True, padx=20, pady=20)
@@ -351,16 +753,18 @@ def configurar_aba_graficos(tab, df):
     frame_inf_esq.pack(side="left", fill="both", expand=True, padx=10)
     
     # Variáveis globais para os gráficos
-    global canvas1, canvas2
+    global canvas1, canvas2, canvas3
     canvas1 = None
     canvas2 = None
+    canvas3 = None
     
-    # Modificar a função para não usar filtragem
-    def atualizar_graficos(dados_filtrados=df):
-        global canvas1, canvas2
+    # Atualizar os gráficos a partir de uma visão (sem visão, usa todos os dados)
+    def atualizar_graficos(visao=None):
+        global canvas1, canvas2, canvas3
         
-        # Processar os dados para normalizar e dividir nomes de técnicos
-        dados_processados = dividir_nomes_tecnicos(dados_filtrados)
+        if visao is None:
+            visao = dados.obter_visao()
+        dados_graficos = visao["graficos"]
         
         # Limpar os frames dos gráficos
         for widget in frame_sup_esq.winfo_children():
@@ -393,37 +797,17 @@ def configurar_aba_graficos(tab, df):
         # grafico_frame = tk.Frame(canvas, bg=cor_fundo)
         # canvas.create_window((0, 0), window=grafico_frame, anchor="nw")
         
-        # Calcular contagem de projetos
-        contagem_projetos = dados_processados["Projeto"].value_counts().sort_values(ascending=False)
-        
-        # Limitar o número de projetos exibidos para manter o gráfico com tamanho similar ao de técnicos
-        # Mostrar apenas os 12 projetos mais frequentes (similar ao gráfico de técnicos)
-        if len(contagem_projetos) > 12:
-            outros_projetos = contagem_projetos[12:].sum()
-            contagem_projetos = contagem_projetos[:12]
-            # Adicionar uma entrada para "Outros projetos"
-            if outros_projetos > 0:
-                contagem_projetos["Outros projetos"] = outros_projetos
+        # Mostrar apenas os projetos mais frequentes e somar o restante em "Outros projetos"
+        # (o custo de desenho depende só das barras exibidas, não do número de projetos)
+        contagem_projetos = top_n_com_outros(dados_graficos["contagem_projetos"],
+                                             MAX_CATEGORIAS_GRAFICO, "Outros projetos")
         
         # Criar figura com tamanho fixo, similar ao gráfico de técnicos
         fig1 = Figure(figsize=(5, 4), dpi=100)
         ax1 = fig1.add_subplot(111)
         
-        # Usar barras horizontais para melhor visualização, com a mesma cor do gráfico de técnicos
-        contagem_projetos.plot(kind="barh", ax=ax1, color="#4682B4")
-        
-        # Configurar título e labels
-        ax1.set_title("Tarefas por Projeto", fontsize=12, fontweight='bold')
-        ax1.set_xlabel("Quantidade", fontsize=10)
-        ax1.set_ylabel("")  # Remover label do eixo Y
-        ax1.tick_params(axis='y', labelsize=8)
-        
-        # Adicionar linhas de grade horizontais para facilitar a leitura
-        ax1.grid(True, axis='x', linestyle='--', alpha=0.7)
-        
-        # Adicionar os valores no final das barras
-        for i, v in enumerate(contagem_projetos):
-            ax1.text(v + 0.1, i, str(v), va='center', fontsize=8)
+        # Usar barras horizontais para melhor visualização, com os valores no final das barras
+        desenhar_barras_horizontais(ax1, contagem_projetos, "Tarefas por Projeto")
         
         # Remover bordas desnecessárias (comentado o contorno cinza)
         ax1.spines['top'].set_visible(False)
@@ -442,33 +826,31 @@ def configurar_aba_graficos(tab, df):
         canvas1.draw()
         canvas1.get_tk_widget().pack(fill="both", expand=True)
         
+        # Botão para ver todos os projetos em páginas
+        tk.Button(frame_grafico_projetos, text="Ranking completo",
+                  command=lambda: exibir_ranking_paginado(dados_graficos["contagem_projetos"], "Tarefas por Projeto"),
+                  font=("Arial", 9), bg="#999", fg="white", padx=8, pady=2, borderwidth=0).pack(pady=5)
+        
         # Comentado: Atualizar região de rolagem do canvas
         # grafico_frame.update_idletasks()
         # canvas.config(scrollregion=canvas.bbox("all"))
         
+        # Exclusões e squads da equipe ativa (máscaras sobre o dicionário de técnicos)
+        resolucao = dados.resolucao_tecnicos
+        titulo_tecnicos = "Tarefas por Squad" if dados.agrupar_squads else "Tarefas por Técnico"
+        contagem_completa = aplicar_em_contagem(dados_graficos["contagem_tecnicos"], resolucao, dados.agrupar_squads)
+        
         # Gráfico 2: Tarefas por Técnico (superior direito)
-        if "Técnico" in dados_processados.columns:
+        if contagem_completa is not None:
             fig2 = Figure(figsize=(5, 4), dpi=100)
             ax2 = fig2.add_subplot(111)
             
-            # Contar tarefas por técnico com nomes normalizados
-            contagem_tecnicos = dados_processados["Técnico"].value_counts().sort_values(ascending=False)
+            # Técnicos com mais tarefas (nomes normalizados) e o restante em "Outros técnicos"
+            contagem_tecnicos = top_n_com_outros(contagem_completa, MAX_CATEGORIAS_GRAFICO,
+                                                 "Outros squads" if dados.agrupar_squads else "Outros técnicos")
             
             # Usar barras horizontais para melhor visualização, como no exemplo
-            contagem_tecnicos.plot(kind="barh", ax=ax2, color="#4682B4")  # Cor azul similar à imagem
-            
-            # Configurar título e labels
-            ax2.set_title("Tarefas por Técnico", fontsize=12, fontweight='bold')
-            ax2.set_xlabel("Quantidade", fontsize=10)
-            ax2.set_ylabel("")  # Remover label do eixo Y
-            ax2.tick_params(axis='y', labelsize=8)
-            
-            # Adicionar linhas de grade horizontais para facilitar a leitura
-            ax2.grid(True, axis='x', linestyle='--', alpha=0.7)
-            
-            # Adicionar os valores no final das barras
-            for i, v in enumerate(contagem_tecnicos):
-                ax2.text(v + 0.1, i, str(v), va='center', fontsize=8)
+            desenhar_barras_horizontais(ax2, contagem_tecnicos, titulo_tecnicos)
             
             # Remover bordas desnecessárias
             ax2.spines['top'].set_visible(False)
@@ -483,65 +865,143 @@ def configurar_aba_graficos(tab, df):
             canvas2 = FigureCanvasTkAgg(fig2, master=frame_sup_dir)
             canvas2.draw()
             canvas2.get_tk_widget().pack(fill="both", expand=True)
+            
+            # Botão para ver todos os técnicos em páginas
+            tk.Button(frame_sup_dir, text="Ranking completo",
+                      command=lambda: exibir_ranking_paginado(contagem_completa, titulo_tecnicos),
+                      font=("Arial", 9), bg="#999", fg="white", padx=8, pady=2, borderwidth=0).pack(pady=5)
+        
+        # Gráfico 3: Mapa de carga Técnico x período (inferior)
+        for widget in frame_inf_esq.winfo_children():
+            widget.destroy()
+        
+        carga = aplicar_em_carga(dados_graficos["carga"], resolucao, dados.agrupar_squads)
+        if carga is not None:
+            fig3 = Figure(figsize=(10, 4), dpi=100)
+            ax3 = fig3.add_subplot(111)
+            
+            # Um único mapa de calor, qualquer que seja o número de técnicos
+            imagem = desenhar_mapa_carga(ax3, carga)
+            fig3.colorbar(imagem, ax=ax3, label="Tarefas abertas")
+            
+            fig3.tight_layout(pad=2.0)
+            
+            # Remover o canvas anterior se existir
+            if canvas3:
+                canvas3.get_tk_widget().destroy()
+            
+            canvas3 = FigureCanvasTkAgg(fig3, master=frame_inf_esq)
+            canvas3.draw()
+            canvas3.get_tk_widget().pack(fill="both", expand=True)
+            
+            # Clique em uma linha do mapa abre a carga daquele técnico (ou squad) ao longo do tempo
+            def abrir_carga_tecnico(event, carga=carga, ax=ax3):
+                if event.inaxes is not ax or event.ydata is None:
+                    return
+                linha = int(round(event.ydata))
+                if 0 <= linha < len(carga["tecnicos"]):
+                    exibir_carga_tecnico(carga, carga["tecnicos"][linha])
+            
+            canvas3.mpl_connect("button_press_event", abrir_carga_tecnico)
     
     # Inicializar os gráficos com todos os dados (sem filtragem)
     atualizar_graficos()
+    
+    return atualizar_graficos
 
-def configurar_aba_metricas(tab, df):
-    # Criar frame para as métricas
-    frame = tk.Frame(tab, bg=cor_fundo)
-    frame.pack(fill="both", expand=True, padx=20, pady=20)
+# Janela com as tarefas abertas de um técnico em cada período do mapa de carga
+def exibir_carga_tecnico(carga, tecnico):
+    serie = tarefas_abertas(carga, tecnico)
+    
+    janela_carga = tk.Toplevel()
+    janela_carga.title(f"Carga de {tecnico}")
+    janela_carga.geometry("800x450")
+    janela_carga.configure(bg=cor_fundo)
+    
+    fig = Figure(figsize=(7, 4), dpi=100)
+    ax = fig.add_subplot(111)
+    ax.step(serie.index, serie.to_numpy(), where="post", color="#4682B4")
+    ax.fill_between(serie.index, serie.to_numpy(), step="post", color="#4682B4", alpha=0.3)
+    periodo = "semana" if carga["granularidade"] == "semana" else "dia"
+    ax.set_title(f"Tarefas abertas por {periodo}: {tecnico}", fontsize=12, fontweight='bold')
+    ax.set_ylabel("Tarefas abertas")
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    fig.autofmt_xdate()
+    fig.tight_layout(pad=2.0)
+    
+    canvas = FigureCanvasTkAgg(fig, master=janela_carga)
+    canvas.draw()
+    canvas.get_tk_widget().pack(fill="both", expand=True, padx=15, pady=10)
+    
+    tk.Label(janela_carga, text=f"Pico: {int(serie.max()) if len(serie) else 0} tarefas abertas", 
+            font=("Arial", 11), bg=cor_fundo).pack(pady=5)
+
+# Janela com o ranking completo de uma contagem, exibido em páginas de barras
+def exibir_ranking_paginado(contagem, titulo):
+    janela_ranking = tk.Toplevel()
+    janela_ranking.title(titulo)
+    janela_ranking.geometry("800x750")
+    janela_ranking.configure(bg=cor_fundo)
     
-    # Calcular métricas
-    total_tarefas = len(df)
-    total_projetos = df["Projeto"].nunique()
+    # O ranking completo é ordenado uma única vez; cada página desenha só as suas barras
+    ranking = ordenar_ranking(contagem)
+    estado = {"pagina": 0, "canvas": None}
     
+    frame_grafico = tk.Frame(janela_ranking, bg=cor_fundo)
+    frame_grafico.pack(fill="both", expand=True, padx=15, pady=10)
     
-    # Calcular média de dias por tarefa
-    media_dias = "N/A"
-    if "Data Início" in df.columns and "Data Vencimento" in df.columns:
-        df_temp = df.copy()
-        df_temp["Data Início"] = pd.to_datetime(df_temp["Data Início"])
-        df_temp["Data Vencimento"] = pd.to_datetime(df_temp["Data Vencimento"])
-        df_temp["Duração (dias)"] = (df_temp["Data Vencimento"] - df_temp["Data Início"]).dt.days
-        media_dias = round(df_temp["Duração (dias)"].mean(), 1)
+    frame_navegacao = tk.Frame(janela_ranking, bg=cor_fundo)
+    frame_navegacao.pack(fill="x", padx=15, pady=10)
     
-    # Encontrar o projeto com mais tarefas
-    projeto_mais_tarefas = df["Projeto"].value_counts().idxmax()
-    qtd_tarefas_projeto = df["Projeto"].value_counts().max()
+    label_pagina = tk.Label(frame_navegacao, font=("Arial", 11), bg=cor_fundo)
     
-    # Encontrar o técnico com mais tarefas
-    if "Técnico" in df.columns:
-        # Usar a função dividir_nomes_tecnicos para normalizar e dividir os nomes
-        df_processado = dividir_nomes_tecnicos(df)
+    def desenhar_pagina():
+        pagina, estado["pagina"], total_paginas = pagina_ranking(ranking, estado["pagina"])
         
-        # Lista de técnicos a serem excluídos da contagem
-        tecnicos_excluidos = ["João Gabriel", "Isabella Cristina", "Paula Grippa"]
+        fig = Figure(figsize=(7, 6.5), dpi=100)
+        ax = fig.add_subplot(111)
         
-        # Filtrar o dataframe para excluir os técnicos da lista
-        df_filtrado = df_processado[~df_processado["Técnico"].isin(tecnicos_excluidos)]
+        # Maior valor da página no topo
+        desenhar_barras_horizontais(ax, pagina.iloc[::-1], titulo)
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        fig.tight_layout(pad=2.0)
         
-        # Verificar se ainda existem técnicos após a filtragem
-        if len(df_filtrado) > 0 and df_filtrado["Técnico"].nunique() > 0:
-            tecnico_mais_tarefas = df_filtrado["Técnico"].value_counts().idxmax()
-            qtd_tarefas_tecnico = df_filtrado["Técnico"].value_counts().max()
-        else:
-            tecnico_mais_tarefas = "N/A"
-            qtd_tarefas_tecnico = 0
-    else:
-        tecnico_mais_tarefas = "N/A"
-        qtd_tarefas_tecnico = 0
-    
-    # Encontrar o dia com mais tarefas
-    if "Data Início" in df.columns:
-        df_temp = df.copy()
-        df_temp["Data"] = pd.to_datetime(df_temp["Data Início"]).dt.date
-        dia_mais_tarefas = df_temp["Data"].value_counts().idxmax()
-        qtd_tarefas_dia = df_temp["Data"].value_counts().max()
-        dia_formatado = dia_mais_tarefas.strftime("%d/%m/%Y") if hasattr(dia_mais_tarefas, "strftime") else str(dia_mais_tarefas)
-    else:
-        dia_formatado = "N/A"
-        qtd_tarefas_dia = 0
+        if estado["canvas"]:
+            estado["canvas"].get_tk_widget().destroy()
+        
+        estado["canvas"] = FigureCanvasTkAgg(fig, master=frame_grafico)
+        estado["canvas"].draw()
+        estado["canvas"].get_tk_widget().pack(fill="both", expand=True)
+        
+        label_pagina.config(text=f"Página {estado['pagina'] + 1} de {total_paginas} ({len(ranking)} itens)")
+    
+    def mudar_pagina(passo):
+        estado["pagina"] += passo
+        desenhar_pagina()
+    
+    tk.Button(frame_navegacao, text="◀ Anterior", command=lambda: mudar_pagina(-1),
+              font=("Arial", 10), bg=cor_destaque, fg="white", padx=10, pady=2, borderwidth=0).pack(side="left", padx=5)
+    label_pagina.pack(side="left", padx=10)
+    tk.Button(frame_navegacao, text="Próxima ▶", command=lambda: mudar_pagina(1),
+              font=("Arial", 10), bg=cor_destaque, fg="white", padx=10, pady=2, borderwidth=0).pack(side="left", padx=5)
+    
+    desenhar_pagina()
+
+def configurar_aba_metricas(tab, dados):
+    df = dados.df
+    
+    # Criar frame para as métricas
+    frame = tk.Frame(tab, bg=cor_fundo)
+    frame.pack(fill="both", expand=True, padx=20, pady=20)
+    
+    # Métricas do grafo de derivados (mesmo cálculo usado nas exportações)
+    metricas = dados.metricas
+    analise_duracoes = metricas["duracoes"]
+    duracao_geral = analise_duracoes["geral"]
+    resultado_validacao = metricas["validacao"]
+    total_erros = resultado_validacao["total_linhas_com_erro"]
     
     # Título com estilo
     tk.Label(frame, text="Métricas Principais", 
@@ -601,16 +1061,134 @@ def configurar_aba_metricas(tab, df):
         
         # Desenhar um retângulo arredondado como ícone
         icone.create_rectangle(2, 2, 14, 14, fill="white", outline=cor_card, width=1)
+        
+        return card
     
     # Criar os cards para as métricas importantes
-    criar_card_metrica(frame_metricas, "Total de Tarefas", total_tarefas, 0, 0)
-    criar_card_metrica(frame_metricas, "Total de Projetos", total_projetos, 0, 1)
-    criar_card_metrica(frame_metricas, "Dia com Mais Tarefas", f"{dia_formatado}\n({qtd_tarefas_dia} tarefas)", 0, 2)
+    criar_card_metrica(frame_metricas, "Total de Tarefas", metricas["total_tarefas"], 0, 0)
+    criar_card_metrica(frame_metricas, "Total de Projetos", metricas["total_projetos"], 0, 1)
+    criar_card_metrica(frame_metricas, "Dia com Mais Tarefas", f"{metricas['dia_formatado']}\n({metricas['qtd_tarefas_dia']} tarefas)", 0, 2)
     
     # Segunda linha de cards
-    criar_card_metrica(frame_metricas, "Projeto com Mais Tarefas", f"{projeto_mais_tarefas}\n({qtd_tarefas_projeto} tarefas)", 1, 0)
-    criar_card_metrica(frame_metricas, "Técnico com Mais Tarefas", f"{tecnico_mais_tarefas}\n({qtd_tarefas_tecnico} tarefas)", 1, 1)
-    criar_card_metrica(frame_metricas, "Erros", "0", 1, 2, "#E74C3C")  # Vermelho para erros
+    criar_card_metrica(frame_metricas, "Projeto com Mais Tarefas", f"{metricas['projeto_mais_tarefas']}\n({metricas['qtd_tarefas_projeto']} tarefas)", 1, 0)
+    criar_card_metrica(frame_metricas, "Técnico com Mais Tarefas", f"{metricas['tecnico_mais_tarefas']}\n({metricas['qtd_tarefas_tecnico']} tarefas)", 1, 1)
+    card_erros = criar_card_metrica(frame_metricas, "Erros (clique para detalhes)", 
+                                    f"{total_erros}\n({resultado_validacao['total_ocorrencias']} ocorrências)", 
+                                    1, 2, "#E74C3C")  # Vermelho para erros
+    
+    # Abrir o detalhamento dos erros ao clicar no card
+    def abrir_detalhes(event=None):
+        exibir_detalhes_erros(df, resultado_validacao)
+    
+    card_erros.config(cursor="hand2")
+    card_erros.bind("<Button-1>", abrir_detalhes)
+    for widget in card_erros.winfo_children():
+        widget.bind("<Button-1>", abrir_detalhes)
+    
+    # Terceira linha de cards: durações e prazos
+    criar_card_metrica(frame_metricas, "Duração Média / Mediana (dias)", 
+                       f"{formatar_dias(duracao_geral['Média'])} / {formatar_dias(duracao_geral['Mediana'])}\n"
+                       f"(P90: {formatar_dias(duracao_geral['P90'])} | P99: {formatar_dias(duracao_geral['P99'])})", 2, 0)
+    criar_card_metrica(frame_metricas, "Tarefas Vencidas", analise_duracoes["vencidas"], 2, 1)
+    criar_card_metrica(frame_metricas, f"Vencem em até {DIAS_A_VENCER} dias", analise_duracoes["a_vencer"], 2, 2)
+    
+    # Histograma de durações e tabela de durações por técnico
+    frame_duracoes = tk.Frame(frame, bg=cor_fundo)
+    frame_duracoes.pack(fill="both", expand=True, pady=10)
+    
+    fig_hist = Figure(figsize=(5, 2.5), dpi=100)
+    ax_hist = fig_hist.add_subplot(111)
+    desenhar_histograma(ax_hist, analise_duracoes["histograma"])
+    fig_hist.tight_layout(pad=1.5)
+    
+    canvas_hist = FigureCanvasTkAgg(fig_hist, master=frame_duracoes)
+    canvas_hist.draw()
+    canvas_hist.get_tk_widget().pack(side="left", fill="both", expand=True, padx=10)
+    
+    colunas_duracao = ["Técnico", "Tarefas", "Média", "Mediana", "P90", "P99"]
+    tree_duracoes = ttk.Treeview(frame_duracoes, columns=colunas_duracao, show="headings", height=8)
+    for col in colunas_duracao:
+        tree_duracoes.heading(col, text=col)
+        tree_duracoes.column(col, width=150 if col == "Técnico" else 70, anchor="center")
+    
+    # Sem os técnicos excluídos pela configuração da equipe
+    for tecnico, linha in aplicar_em_tabela(analise_duracoes["por_tecnico"], dados.resolucao_tecnicos).iterrows():
+        tree_duracoes.insert("", "end", values=[tecnico, int(linha["Tarefas"])] +
+                             [formatar_dias(linha[col]) for col in colunas_duracao[2:]])
+    
+    tree_duracoes.pack(side="right", fill="both", expand=True, padx=10)
+
+def exibir_detalhes_erros(df, resultado_validacao, limite_linhas=1000):
+    # Criar uma nova janela para o detalhamento dos erros
+    janela_erros = tk.Toplevel()
+    janela_erros.title("Detalhes dos Erros")
+    janela_erros.geometry("1000x600")
+    janela_erros.configure(bg=cor_fundo)
+    
+    frame = tk.Frame(janela_erros, bg=cor_fundo)
+    frame.pack(fill="both", expand=True, padx=15, pady=15)
+    
+    tk.Label(frame, text="Erros de Qualidade dos Dados", 
+            font=("Arial", 14, "bold"), bg=cor_fundo).pack(pady=10)
+    
+    # Resumo com a contagem de cada regra
+    frame_resumo = tk.Frame(frame, bg=cor_fundo)
+    frame_resumo.pack(fill="x", pady=5)
+    for nome, quantidade in resultado_validacao["contagens"].items():
+        cor = "#E74C3C" if quantidade > 0 else "#666666"
+        tk.Label(frame_resumo, text=f"{nome}: {quantidade}", 
+                font=("Arial", 10), bg=cor_fundo, fg=cor).pack(anchor="w", padx=10)
+    
+    # Lista das linhas com erro: só as primeiras limite_linhas são montadas e exibidas
+    df_erros = linhas_com_erros(df, resultado_validacao, limite_linhas)
+    total_erros = resultado_validacao["total_linhas_com_erro"]
+    
+    frame_tabela = tk.Frame(frame)
+    frame_tabela.pack(fill="both", expand=True, pady=10)
+    
+    scrollbar_y = tk.Scrollbar(frame_tabela)
+    scrollbar_y.pack(side="right", fill="y")
+    
+    scrollbar_x = tk.Scrollbar(frame_tabela, orient="horizontal")
+    scrollbar_x.pack(side="bottom", fill="x")
+    
+    colunas = ["Erros", "ID tarefa", "URL tarefa", "Projeto", "Atividade", 
+               "Data Início", "Data Vencimento", "Técnico"]
+    
+    tree = ttk.Treeview(frame_tabela, columns=colunas, show="headings",
+                        yscrollcommand=scrollbar_y.set,
+                        xscrollcommand=scrollbar_x.set)
+    
+    scrollbar_y.config(command=tree.yview)
+    scrollbar_x.config(command=tree.xview)
+    
+    for col in colunas:
+        tree.heading(col, text=col)
+        tree.column(col, width=200 if col == "Erros" else 120, anchor="center")
+    
+    # Inserir dados
+    for valores in construir_exibicao(df_erros, colunas).to_numpy().tolist():
+        tree.insert("", "end", values=valores)
+    
+    tree.pack(fill="both", expand=True)
+    
+    # Frame para botões e informações
+    frame_botoes = tk.Frame(frame, bg=cor_fundo)
+    frame_botoes.pack(fill="x", pady=10)
+    
+    texto_total = f"Linhas com erro: {total_erros}"
+    if total_erros > limite_linhas:
+        texto_total += f" (exibindo {len(df_erros)} de {total_erros})"
+    tk.Label(frame_botoes, text=texto_total, 
+            font=("Arial", 11), bg=cor_fundo).pack(side="left", padx=10)
+    
+    # A exportação monta a lista completa, só quando pedida
+    colunas_exportar = [col for col in colunas if col in df_erros.columns]
+    btn_exportar = tk.Button(frame_botoes, text="Exportar Erros", 
+                            command=lambda: exportar_excel(linhas_com_erros(df, resultado_validacao)[colunas_exportar], "erros"),
+                            font=("Arial", 11), bg=cor_destaque, fg="white",
+                            padx=15, pady=5, borderwidth=0)
+    btn_exportar.pack(side="right", padx=10)
 
 def exportar_excel(df, nome_arquivo="dados_exportados"):
     # Solicitar ao usuário onde salvar o arquivo
@@ -630,7 +1208,78 @@ def exportar_excel(df, nome_arquivo="dados_exportados"):
     except Exception as e:
         messagebox.showerror("Erro ao exportar", str(e))
 
-def exportar_pdf(df):
+# Função para exportar um dashboard HTML autocontido, com filtros que funcionam no navegador
+def exportar_html(dados):
+    caminho_salvar = filedialog.asksaveasfilename(
+        defaultextension=".html",
+        filetypes=[("Páginas HTML", "*.html")],
+        title="Salvar HTML como"
+    )
+    
+    if not caminho_salvar:
+        return
+    
+    try:
+        # Prazos do relatório em relação ao dia da exportação
+        dados.atualizar_hoje()
+        # Reaproveitar os textos de exibição já calculados para a tabela
+        gerar_html(dados.df, caminho_salvar, exibicao=dados.exibicao, grafo=dados.grafo,
+                   agrupar_squads=dados.agrupar_squads)
+        messagebox.showinfo("Sucesso", f"HTML exportado com sucesso para:\n{caminho_salvar}")
+    except Exception as e:
+        messagebox.showerror("Erro ao exportar HTML", str(e))
+
+# Função para acompanhar uma exportação que roda em segundo plano sem travar a interface
+# A verificação é agendada na janela principal: fechar o dashboard durante a exportação
+# não interrompe o acompanhamento e o resultado (ou o erro do processo) ainda é mostrado
+def acompanhar_exportacao(janela, futuro, mensagem_sucesso, titulo_erro):
+    raiz = janela.nametowidget(".")
+    
+    def verificar():
+        if not futuro.done():
+            try:
+                raiz.after(200, verificar)
+            except tk.TclError:
+                # O aplicativo foi fechado
+                pass
+            return
+        
+        # Mensagens presas à janela de origem enquanto ela existir
+        opcoes = {"parent": janela} if janela.winfo_exists() else {}
+        try:
+            caminho = futuro.result()
+            messagebox.showinfo("Sucesso", f"{mensagem_sucesso}\n{caminho}", **opcoes)
+        except Exception as e:
+            # Exceções dos processos podem vir sem mensagem (ex.: processo encerrado)
+            messagebox.showerror(titulo_erro, str(e) or type(e).__name__, **opcoes)
+    
+    verificar()
+
+# Função para exportar todas as linhas para Excel em um processo separado
+# O processo lê a tabela da memória compartilhada (o dataframe não é serializado)
+def exportar_excel_dados(dados, colunas, janela):
+    caminho_arquivo = filedialog.asksaveasfilename(
+        defaultextension=".xlsx",
+        filetypes=[("Planilhas Excel", "*.xlsx")],
+        initialfile="dados_exportados.xlsx"
+    )
+    
+    if not caminho_arquivo:
+        return
+    
+    try:
+        tabela = dados.tabela_compartilhada
+    except Exception as e:
+        messagebox.showerror("Erro ao exportar", str(e))
+        return
+    
+    futuro = executar_em_segundo_plano(exportar_excel_em_trabalhadores, tabela.descritor, caminho_arquivo, colunas)
+    # O bloco compartilhado só é liberado depois que a exportação terminar
+    tabela.manter_ate(futuro)
+    acompanhar_exportacao(janela, futuro, "Dados exportados com sucesso para", "Erro ao exportar")
+
+# Função para exportar o relatório PDF; os gráficos e o documento são gerados em processos separados
+def exportar_pdf(dados, janela):
     caminho_salvar = filedialog.asksaveasfilename(
         defaultextension=".pdf",
         filetypes=[("Arquivos PDF", "*.pdf")],
@@ -641,228 +1290,99 @@ def exportar_pdf(df):
         return
     
     try:
-        # Criar o documento PDF
-        doc = SimpleDocTemplate(caminho_salvar, pagesize=A4)
-        elementos = []
-        
-        # Estilos
-        estilos = getSampleStyleSheet()
-        estilo_titulo = estilos["Heading1"]
-        estilo_subtitulo = estilos["Heading2"]
-        estilo_normal = estilos["Normal"]
-        
-        # Título
-        elementos.append(Paragraph("Dashboard de Métricas", estilo_titulo))
-        elementos.append(Spacer(1, 20))
-        
-        # Seção 1: Métricas Principais
-        elementos.append(Paragraph("Métricas Principais", estilo_subtitulo))
-        elementos.append(Spacer(1, 10))
-        
-        # Calcular métricas
-        total_tarefas = len(df)
-        total_projetos = df["Projeto"].nunique()
-
-        
-        # Calcular média de dias por tarefa
-        media_dias = "N/A"
-        if "Data Início" in df.columns and "Data Vencimento" in df.columns:
-            df_temp = df.copy()
-            df_temp["Data Início"] = pd.to_datetime(df_temp["Data Início"])
-            df_temp["Data Vencimento"] = pd.to_datetime(df_temp["Data Vencimento"])
-            df_temp["Duração (dias)"] = (df_temp["Data Vencimento"] - df_temp["Data Início"]).dt.days
-            media_dias = round(df_temp["Duração (dias)"].mean(), 1)
-        
-        # Tabela de métricas
-        dados_metricas = [
-            ["Métrica", "Valor"],
-            ["Total de Tarefas", str(total_tarefas)],
-            ["Total de Projetos", str(total_projetos)],
-            ["Média de Dias por Tarefa", str(media_dias)]
-        ]
-        
-        if "Projeto" in df.columns:
-            projeto_mais_tarefas = df["Projeto"].value_counts().idxmax()
-            qtd_tarefas_projeto = df["Projeto"].value_counts().max()
-            dados_metricas.append(["Projeto com Mais Tarefas", f"{projeto_mais_tarefas} ({qtd_tarefas_projeto} tarefas)"])
-        
-        if "Técnico" in df.columns:
-            tecnico_mais_tarefas = df["Técnico"].value_counts().idxmax()
-            qtd_tarefas_tecnico = df["Técnico"].value_counts().max()
-            dados_metricas.append(["Técnico com Mais Tarefas", f"{tecnico_mais_tarefas} ({qtd_tarefas_tecnico} tarefas)"])
-        
-        tabela_metricas = Table(dados_metricas, colWidths=[300, 200])
-        tabela_metricas.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (1, 0), 'CENTER'),
-            ('FONTNAME', (0, 0), (1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (1, 0), 12),
-            ('BACKGROUND', (0, 1), (1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elementos.append(tabela_metricas)
-        elementos.append(Spacer(1, 20))
-        
-        # Seção 2: Gráficos
-        elementos.append(Paragraph("Gráficos", estilo_subtitulo))
-        elementos.append(Spacer(1, 10))
-        
-        # Gráfico 1: Tarefas por Projeto
-        fig1 = Figure(figsize=(8, 4))
-        ax1 = fig1.add_subplot(111)
-        contagem_projetos = df["Projeto"].value_counts()
-        contagem_projetos.plot(kind="bar", ax=ax1)
-        ax1.set_title("Tarefas por Projeto")
-        ax1.set_ylabel("Quantidade")
-        ax1.tick_params(axis='x', rotation=45)
-        fig1.tight_layout()
-        
-        # Salvar o gráfico como imagem
-        buf1 = io.BytesIO()
-        fig1.savefig(buf1, format='png')
-        buf1.seek(0)
-        
-        # Adicionar o gráfico ao PDF
-        img1 = Image(buf1, width=450, height=250)
-        elementos.append(img1)
-        elementos.append(Spacer(1, 20))
-        
-        # Gráfico 2: Tarefas por Técnico
-        if "Técnico" in df.columns:
-            fig2 = Figure(figsize=(8, 4))
-            ax2 = fig2.add_subplot(111)
-            contagem_tecnicos = df["Técnico"].value_counts()
-            contagem_tecnicos.plot(kind="bar", ax=ax2)
-            ax2.set_title("Tarefas por Técnico")
-            ax2.set_ylabel("Quantidade")
-            ax2.tick_params(axis='x', rotation=45)
-            fig2.tight_layout()
-            
-            # Salvar o gráfico como imagem
-            buf2 = io.BytesIO()
-            fig2.savefig(buf2, format='png')
-            buf2.seek(0)
-            
-            # Adicionar o gráfico ao PDF
-            img2 = Image(buf2, width=450, height=250)
-            elementos.append(img2)
-            elementos.append(Spacer(1, 20))
-        
-        # Seção 3: Tabela de Dados
-        elementos.append(Paragraph("Dados das Tarefas", estilo_subtitulo))
-        elementos.append(Spacer(1, 10))
-        
-        # Preparar dados para a tabela
-        colunas = ["ID tarefa", "Projeto", "Atividade", "Data Início", "Data Vencimento", "Técnico"]
-        dados_tabela = [colunas]  # Cabeçalho
-        
-        # Limitar a 20 linhas para não sobrecarregar o PDF
-        for _, row in df.head(20).iterrows():
-            linha = []
-            for col in colunas:
-                if col in df.columns:
-                    valor = row[col]
-                    # Formatar datas
-                    if isinstance(valor, (datetime.datetime, pd.Timestamp)):
-                        valor = valor.strftime("%d/%m/%Y")
-                    linha.append(str(valor) if not pd.isna(valor) else "")
-                else:
-                    linha.append("")
-            dados_tabela.append(linha)
-        
-        # Criar a tabela
-        tabela_dados = Table(dados_tabela, colWidths=[60, 100, 150, 80, 80, 50])
-        tabela_dados.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elementos.append(tabela_dados)
-        
-        # Adicionar nota de rodapé
-        elementos.append(Spacer(1, 30))
-        elementos.append(Paragraph(f"Relatório gerado em {datetime.datetime.now().strftime('%d/%m/%Y %H:%M:%S')}", estilo_normal))
-        
-        # Construir o PDF
-        doc.build(elementos)
-        
-        messagebox.showinfo("Sucesso", f"PDF exportado com sucesso para:\n{caminho_salvar}")
-        
+        tabela = dados.tabela_compartilhada
     except Exception as e:
         messagebox.showerror("Erro ao exportar PDF", str(e))
+        return
+    
+    futuro = executar_em_segundo_plano(exportar_pdf_em_trabalhadores, tabela.descritor, caminho_salvar,
+                                        dados.opcoes_tecnicos())
+    # O bloco compartilhado só é liberado depois que a exportação terminar
+    tabela.manter_ate(futuro)
+    acompanhar_exportacao(janela, futuro, "PDF exportado com sucesso para:", "Erro ao exportar PDF")
 
 # Interface principal
-janela = tk.Tk()
-janela.title("Analisador de Planilhas")
-janela.geometry("500x400")  # Aumentar o tamanho da janela
+# Protegida por __main__: os processos de leitura em paralelo importam este módulo novamente
+if __name__ == "__main__":
+    janela = tk.Tk()
+    janela.title("Analisador de Planilhas")
+    janela.geometry("500x550")  # Aumentar o tamanho da janela
 
-# Configurar cores e estilos
-cor_fundo = "#f0f0f0"
-cor_destaque = "#4CAF50"
-cor_texto = "#333333"
-cor_texto_claro = "white"
+    janela.configure(bg=cor_fundo)
 
-janela.configure(bg=cor_fundo)
+    # Estilizar a interface principal
+    frame_principal = tk.Frame(janela, padx=30, pady=30, bg=cor_fundo)
+    frame_principal.pack(fill="both", expand=True)
 
-# Estilizar a interface principal
-frame_principal = tk.Frame(janela, padx=30, pady=30, bg=cor_fundo)
-frame_principal.pack(fill="both", expand=True)
+    # Logo ou ícone (pode ser substituído por uma imagem real)
+    frame_logo = tk.Frame(frame_principal, bg=cor_fundo, height=80)
+    frame_logo.pack(fill="x", pady=10)
+    tk.Label(frame_logo, text="📊", font=("Arial", 40), bg=cor_fundo, fg=cor_destaque).pack()
 
-# Logo ou ícone (pode ser substituído por uma imagem real)
-frame_logo = tk.Frame(frame_principal, bg=cor_fundo, height=80)
-frame_logo.pack(fill="x", pady=10)
-tk.Label(frame_logo, text="📊", font=("Arial", 40), bg=cor_fundo, fg=cor_destaque).pack()
+    # Título com estilo melhorado
+    titulo = tk.Label(frame_principal, text="Analisador de Planilhas", 
+                     font=("Arial", 22, "bold"), bg=cor_fundo, fg=cor_texto)
+    titulo.pack(pady=20)
 
-# Título com estilo melhorado
-titulo = tk.Label(frame_principal, text="Analisador de Planilhas", 
-                 font=("Arial", 22, "bold"), bg=cor_fundo, fg=cor_texto)
-titulo.pack(pady=20)
+    # Descrição com estilo melhorado
+    descricao = tk.Label(frame_principal, 
+                        text="Selecione uma planilha Excel para analisar e gerar um dashboard interativo com métricas e gráficos.", 
+                        font=("Arial", 11), wraplength=400, bg=cor_fundo, fg=cor_texto)
+    descricao.pack(pady=20)
 
-# Descrição com estilo melhorado
-descricao = tk.Label(frame_principal, 
-                    text="Selecione uma planilha Excel para analisar e gerar um dashboard interativo com métricas e gráficos.", 
-                    font=("Arial", 11), wraplength=400, bg=cor_fundo, fg=cor_texto)
-descricao.pack(pady=20)
+    # Frame para botões
+    frame_botoes = tk.Frame(frame_principal, bg=cor_fundo)
+    frame_botoes.pack(pady=20)
+
+    # Botão estilizado com hover effect
+    estilo_botao = {"font": ("Arial", 12, "bold"), "bg": cor_destaque, "fg": cor_texto_claro, 
+                   "activebackground": "#45a049", "relief": tk.RAISED, "padx": 25, "pady": 12,
+                   "borderwidth": 0, "cursor": "hand2"}
 
-# Frame para botões
-frame_botoes = tk.Frame(frame_principal, bg=cor_fundo)
-frame_botoes.pack(pady=20)
+    botao = tk.Button(frame_botoes, text="Selecionar Planilha", command=selecionar_arquivo, **estilo_botao)
+    botao.pack(pady=10)
 
-# Botão estilizado com hover effect
-estilo_botao = {"font": ("Arial", 12, "bold"), "bg": cor_destaque, "fg": cor_texto_claro, 
-               "activebackground": "#45a049", "relief": tk.RAISED, "padx": 25, "pady": 12,
-               "borderwidth": 0, "cursor": "hand2"}
+    # Botão para comparar duas exportações
+    botao_comparar = tk.Button(frame_botoes, text="Comparar Planilhas", command=selecionar_comparacao,
+                               font=("Arial", 10), bg="#999", fg="white", padx=15, pady=6,
+                               borderwidth=0, cursor="hand2")
+    botao_comparar.pack(pady=5)
 
-botao = tk.Button(frame_botoes, text="Selecionar Planilha", command=selecionar_arquivo, **estilo_botao)
-botao.pack(pady=10)
+    # Botão para planilhas maiores que a memória (processadas em blocos no disco)
+    botao_disco = tk.Button(frame_botoes, text="Planilha Grande (modo em disco)", command=selecionar_arquivo_em_disco,
+                            font=("Arial", 10), bg="#999", fg="white", padx=15, pady=6,
+                            borderwidth=0, cursor="hand2")
+    botao_disco.pack(pady=5)
 
-# Adicionar rodapé
-rodape = tk.Label(frame_principal, text="© 2023 Analisador de Planilhas", 
-                 font=("Arial", 8), bg=cor_fundo, fg="#999999")
-rodape.pack(side="bottom", pady=10)
+    # Botão para abrir várias planilhas/abas em paralelo
+    botao_varias = tk.Button(frame_botoes, text="Várias Planilhas / Abas", command=selecionar_varias_planilhas,
+                             font=("Arial", 10), bg="#999", fg="white", padx=15, pady=6,
+                             borderwidth=0, cursor="hand2")
+    botao_varias.pack(pady=5)
 
-# Centralizar a janela na tela
-largura_janela = 500
-altura_janela = 400
-largura_tela = janela.winfo_screenwidth()
-altura_tela = janela.winfo_screenheight()
-x = (largura_tela - largura_janela) // 2
-y = (altura_tela - altura_janela) // 2
-janela.geometry(f"{largura_janela}x{altura_janela}+{x}+{y}")
+    # Adicionar rodapé
+    rodape = tk.Label(frame_principal, text="© 2023 Analisador de Planilhas", 
+                     font=("Arial", 8), bg=cor_fundo, fg="#999999")
+    rodape.pack(side="bottom", pady=10)
 
-janela.mainloop()
+    # Centralizar a janela na tela
+    largura_janela = 500
+    altura_janela = 550
+    largura_tela = janela.winfo_screenwidth()
+    altura_tela = janela.winfo_screenheight()
+    x = (largura_tela - largura_janela) // 2
+    y = (altura_tela - altura_janela) // 2
+    janela.geometry(f"{largura_janela}x{altura_janela}+{x}+{y}")
+
+    janela.mainloop()
+    
+    # Encerrar os processos de exportação ao fechar o aplicativo
+    encerrar_pools()
 
 
-def configurar_aba_intercorrencias(tab, df):
+def configurar_aba_intercorrencias(tab, dados):
+    df = dados.df
+    
     # Criar um frame com scrollbar
     frame = tk.Frame(tab, bg=cor_fundo)
     frame.pack(fill="both", expand=True, padx=15, pady=15)
@@ -875,15 +1395,12 @@ def configurar_aba_intercorrencias(tab, df):
     # Assumindo que as intercorrências são identificadas pela coluna "Atividade" contendo palavras-chave
     palavras_chave_erro = ["erro", "falha", "problema", "bug", "defeito", "intercorrência", "incidente"]
     
-    # Função para verificar se uma atividade é uma intercorrência
-    def eh_intercorrencia(atividade):
-        if pd.isna(atividade):
-            return False
-        atividade = str(atividade).lower()
-        return any(palavra in atividade for palavra in palavras_chave_erro)
+    # Verificar as atividades no texto de exibição (minúsculas) com uma única expressão
+    atividades = dados.exibicao["Atividade"].str.lower()
+    eh_intercorrencia = atividades.str.contains("|".join(palavras_chave_erro), regex=True).to_numpy()
     
     # Filtrar o DataFrame
-    df_intercorrencias = df[df["Atividade"].apply(eh_intercorrencia)]
+    df_intercorrencias = df[eh_intercorrencia]
     
     # Frame para a tabela
     frame_tabela = tk.Frame(frame)
@@ -938,25 +1455,8 @@ def configurar_aba_intercorrencias(tab, df):
     # Vincular evento de clique duplo à função de abrir URL
     tree.bind("<Double-1>", abrir_url)
     
-    # Inserir dados
-    for _, row in df_intercorrencias.iterrows():
-        valores = []
-        for col in colunas:
-            if col in df.columns:
-                valor = row[col]
-                # Formatar datas
-                if isinstance(valor, (datetime.datetime, pd.Timestamp)):
-                    valor = valor.strftime("%d/%m/%Y")
-                # Formatar URL da tarefa para incluir o domínio completo
-                if col == "URL tarefa" and not pd.isna(valor) and valor != "":
-                    # Verificar se a URL já tem o protocolo (http:// ou https://)
-                    if not valor.startswith(("http://", "https://")):
-                        # Se não tiver, adicionar https://
-                        valor = "https://" + valor
-                valores.append(str(valor) if not pd.isna(valor) else "")
-            else:
-                valores.append("")
-        
+    # Inserir dados (linhas já formatadas na camada de exibição)
+    for valores in dados.exibicao.to_numpy()[eh_intercorrencia].tolist():
         tree.insert("", "end", values=valores)
     
     # Configurar estilo para links
@@ -0,0 +1,139 @@
+import pickle
+import threading
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+# Cada coluna começa em um múltiplo deste valor dentro do bloco de memória
+ALINHAMENTO = 64
+
+
+def _alinhar(posicao):
+    return (posicao + ALINHAMENTO - 1) // ALINHAMENTO * ALINHAMENTO
+
+
+# Função para converter uma coluna em um array de tamanho fixo
+# Números e datas são copiados como estão; textos e demais valores viram códigos inteiros
+# de um dicionário com os valores distintos (só o dicionário precisa ser serializado)
+def _codificar_coluna(serie):
+    if pd.api.types.is_datetime64_ns_dtype(serie.dtype) and getattr(serie.dtype, "tz", None) is None:
+        return "data", serie.to_numpy().view(np.int64), None
+
+    if isinstance(serie.dtype, np.dtype) and serie.dtype.kind in "biuf":
+        return "numero", np.ascontiguousarray(serie.to_numpy()), None
+
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return "dicionario", serie.cat.codes.to_numpy(dtype=np.int32), serie.cat.categories.to_numpy(dtype=object)
+
+    codigos, valores = pd.factorize(serie, use_na_sentinel=True)
+    return "dicionario", codigos.astype(np.int32), np.asarray(valores, dtype=object)
+
+
+# Tabela de tarefas publicada uma única vez em memória compartilhada
+# O descritor é pequeno (nome do bloco, posições e tipos das colunas) e é o único dado
+# enviado aos processos; eles anexam o mesmo bloco com anexar_tabela
+class TabelaCompartilhada:
+    def __init__(self, df):
+        colunas = []
+        dicionarios = {}
+        posicao = 0
+        arrays = []
+        for nome in df.columns:
+            tipo, array, dicionario = _codificar_coluna(df[nome])
+            colunas.append({
+                "nome": nome,
+                "tipo": tipo,
+                "dtype": array.dtype.str,
+                "inicio": posicao,
+                "tamanho": array.nbytes,
+            })
+            arrays.append(array)
+            if dicionario is not None:
+                dicionarios[nome] = dicionario
+            posicao = _alinhar(posicao + array.nbytes)
+
+        # Dicionários dos textos no final do bloco (valores distintos, não um valor por linha)
+        dicionarios_bytes = pickle.dumps(dicionarios, protocol=pickle.HIGHEST_PROTOCOL)
+        inicio_dicionarios = posicao
+        tamanho_total = max(1, inicio_dicionarios + len(dicionarios_bytes))
+
+        self.shm = shared_memory.SharedMemory(create=True, size=tamanho_total)
+        for coluna, array in zip(colunas, arrays):
+            destino = np.ndarray(array.shape, dtype=array.dtype, buffer=self.shm.buf, offset=coluna["inicio"])
+            destino[:] = array
+        self.shm.buf[inicio_dicionarios:inicio_dicionarios + len(dicionarios_bytes)] = dicionarios_bytes
+
+        self.descritor = {
+            "nome": self.shm.name,
+            "linhas": len(df),
+            "colunas": colunas,
+            "dicionarios": (inicio_dicionarios, len(dicionarios_bytes)),
+        }
+        self.tamanho = tamanho_total
+        # Exportações ainda em andamento que usam o bloco (ver manter_ate)
+        self._pendentes = 0
+        self._liberar_ao_concluir = False
+        self._trava = threading.Lock()
+
+    # Mantém o bloco até o futuro terminar: uma exportação na fila pode anexar o bloco
+    # depois que o dashboard foi fechado ou os dados foram substituídos
+    def manter_ate(self, futuro):
+        with self._trava:
+            self._pendentes += 1
+        futuro.add_done_callback(self._concluir)
+
+    # Chamada na thread do futuro ao terminar uma exportação; libera o bloco se já foi pedido
+    def _concluir(self, futuro):
+        with self._trava:
+            self._pendentes -= 1
+            liberar = self._pendentes == 0 and self._liberar_ao_concluir
+        if liberar:
+            self.liberar()
+
+    # Libera o bloco (processos que já anexaram continuam com acesso até fecharem)
+    # Com exportações pendentes, a liberação fica para quando a última terminar
+    def liberar(self):
+        with self._trava:
+            if self._pendentes > 0:
+                self._liberar_ao_concluir = True
+                return
+            if self.shm is None:
+                return
+            self._liberar_bloco()
+
+    def _liberar_bloco(self):
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+        self.shm = None
+
+
+# Função para anexar uma tabela publicada a partir do descritor
+# Colunas numéricas e de data são vistas diretas sobre o bloco (sem cópia); colunas de texto
+# viram categóricas com os códigos do bloco e o dicionário como categorias
+# Retorna o dataframe e o bloco, que deve continuar aberto enquanto o dataframe for usado
+def anexar_tabela(descritor):
+    shm = shared_memory.SharedMemory(name=descritor["nome"])
+    linhas = descritor["linhas"]
+
+    inicio, tamanho = descritor["dicionarios"]
+    dicionarios = pickle.loads(shm.buf[inicio:inicio + tamanho])
+
+    dados = {}
+    for coluna in descritor["colunas"]:
+        array = np.ndarray((linhas,), dtype=np.dtype(coluna["dtype"]), buffer=shm.buf, offset=coluna["inicio"])
+        array.flags.writeable = False
+
+        if coluna["tipo"] == "data":
+            dados[coluna["nome"]] = pd.Series(array.view("datetime64[ns]"), copy=False)
+        elif coluna["tipo"] == "numero":
+            dados[coluna["nome"]] = pd.Series(array, copy=False)
+        else:
+            # Categórica com os códigos do bloco: os textos não são repetidos por linha
+            # (só os códigos inteiros são copiados; código -1 é valor ausente)
+            dados[coluna["nome"]] = pd.Series(pd.Categorical.from_codes(array, dicionarios[coluna["nome"]]), copy=False)
+
+    return pd.DataFrame(dados, copy=False), shm
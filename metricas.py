@@ -0,0 +1,150 @@
+import pandas as pd
+
+from grafo_derivados import GrafoDerivados
+from tecnicos import dividir_nomes_tecnicos, posicoes_expandidas, aplicar_aliases
+from validacao import avaliar_regras
+from duracoes import analisar_duracoes
+from carga_tecnicos import calcular_carga
+from config_tecnicos import config_padrao, resolver_config, aplicar_em_contagem
+from datas import converter_datas
+
+
+# Função para obter o item com maior contagem e a contagem (uma única contagem para os dois)
+def _maior(contagem):
+    if contagem is None or len(contagem) == 0:
+        return "N/A", 0
+    return contagem.idxmax(), int(contagem.max())
+
+
+def _dividir(df):
+    return dividir_nomes_tecnicos(df)
+
+
+def _contagem_tecnicos(df_expandido):
+    if "Técnico" not in df_expandido.columns:
+        return None
+    return df_expandido["Técnico"].value_counts()
+
+
+# Dicionário de técnicos distintos (a configuração da equipe é resolvida sobre ele)
+def _dicionario_tecnicos(contagem_tecnicos):
+    if contagem_tecnicos is None:
+        return pd.Index([], dtype=object)
+    return contagem_tecnicos.index
+
+
+def _maior_tecnico(contagem_tecnicos, resolucao):
+    if contagem_tecnicos is None:
+        return "N/A", 0
+    return _maior(aplicar_em_contagem(contagem_tecnicos, resolucao))
+
+
+def _dias_inicio(df):
+    if "Data Início" not in df.columns:
+        return None
+    return converter_datas(df["Data Início"]).dt.normalize()
+
+
+def _maior_dia(contagem_dias):
+    dia, quantidade = _maior(contagem_dias)
+    if quantidade == 0:
+        return "N/A", 0
+    return dia.strftime("%d/%m/%Y"), quantidade
+
+
+def _duracoes(df, df_expandido, hoje):
+    return analisar_duracoes(df, df_expandido if "Técnico" in df_expandido.columns else None, hoje)
+
+
+def _carga(df_expandido):
+    if "Técnico" not in df_expandido.columns:
+        return None
+    return calcular_carga(df_expandido)
+
+
+# Dados dos gráficos da visão completa: contagens de projetos e técnicos e mapa de carga
+def _dados_graficos(df_expandido, contagem_tecnicos, carga):
+    return {
+        "contagem_projetos": df_expandido["Projeto"].value_counts(sort=False),
+        "contagem_tecnicos": contagem_tecnicos,
+        "carga": carga,
+    }
+
+
+# Dados dos gráficos de uma visão filtrada: as linhas expandidas já calculadas são selecionadas
+# pela máscara das linhas do dataframe (os nomes não são divididos nem traduzidos de novo)
+def _dados_graficos_filtrados(df_expandido, posicoes, filtro):
+    if filtro is not None:
+        df_expandido = df_expandido[filtro[posicoes]]
+    contagem_tecnicos = None
+    if "Técnico" in df_expandido.columns:
+        contagem_tecnicos = df_expandido["Técnico"].value_counts(sort=False)
+    return _dados_graficos(df_expandido, contagem_tecnicos, _carga(df_expandido))
+
+
+def _montar_metricas(df, maior_projeto, maior_tecnico, maior_dia, analise_duracoes, resultado_validacao):
+    return {
+        "total_tarefas": len(df),
+        "total_projetos": df["Projeto"].nunique(),
+        "projeto_mais_tarefas": maior_projeto[0],
+        "qtd_tarefas_projeto": maior_projeto[1],
+        "tecnico_mais_tarefas": maior_tecnico[0],
+        "qtd_tarefas_tecnico": maior_tecnico[1],
+        "dia_formatado": maior_dia[0],
+        "qtd_tarefas_dia": maior_dia[1],
+        "duracoes": analise_duracoes,
+        "validacao": resultado_validacao,
+    }
+
+
+# Função para registrar os valores derivados da tabela de tarefas em um grafo
+# Entradas: "dados" (dataframe), "aliases" (apelido -> nome), "config" (equipes, exclusões e squads),
+# "equipe" (equipe ativa), "hoje" (data de referência dos prazos) e "filtro" (máscara das linhas
+# da visão filtrada, usada só por "graficos_filtrados")
+def registrar_derivados(grafo):
+    grafo.registrar("expandido_bruto", ["dados"], _dividir)
+    grafo.registrar("expandido", ["expandido_bruto", "aliases"], aplicar_aliases)
+    grafo.registrar("contagem_projetos", ["dados"], lambda df: df["Projeto"].value_counts())
+    grafo.registrar("contagem_tecnicos", ["expandido"], _contagem_tecnicos)
+    grafo.registrar("dias_inicio", ["dados"], _dias_inicio)
+    grafo.registrar("contagem_dias", ["dias_inicio"], lambda dias: None if dias is None else dias.value_counts())
+    grafo.registrar("maior_projeto", ["contagem_projetos"], _maior)
+    grafo.registrar("dicionario_tecnicos", ["contagem_tecnicos"], _dicionario_tecnicos)
+    grafo.registrar("resolucao_tecnicos", ["config", "equipe", "dicionario_tecnicos"], resolver_config)
+    grafo.registrar("maior_tecnico", ["contagem_tecnicos", "resolucao_tecnicos"], _maior_tecnico)
+    grafo.registrar("maior_dia", ["contagem_dias"], _maior_dia)
+    grafo.registrar("duracoes", ["dados", "expandido", "hoje"], _duracoes)
+    grafo.registrar("validacao", ["dados"], avaliar_regras)
+    grafo.registrar("carga", ["expandido"], _carga)
+    grafo.registrar("graficos", ["expandido", "contagem_tecnicos", "carga"], _dados_graficos)
+    grafo.registrar("posicoes_expandido", ["dados"], posicoes_expandidas)
+    grafo.registrar("graficos_filtrados", ["expandido", "posicoes_expandido", "filtro"], _dados_graficos_filtrados)
+    grafo.registrar("metricas", ["dados", "maior_projeto", "maior_tecnico", "maior_dia", "duracoes", "validacao"],
+                    _montar_metricas)
+    return grafo
+
+
+# Função para criar o grafo de derivados de uma tabela de tarefas
+# Sem config, usa a configuração padrão (o arquivo não é lido aqui: quem chama passa a configuração carregada)
+def criar_grafo_tarefas(df, config=None, equipe=None, hoje=None):
+    if config is None:
+        config = config_padrao()
+    grafo = GrafoDerivados()
+    grafo.definir_entrada("dados", df)
+    grafo.definir_entrada("config", config)
+    grafo.definir_entrada("equipe", equipe if equipe in config["equipes"] else config["equipe_padrao"])
+    grafo.definir_entrada("aliases", dict(config["aliases"]))
+    grafo.definir_entrada("hoje", pd.Timestamp.today().normalize() if hoje is None else hoje)
+    grafo.definir_entrada("filtro", None)
+    return registrar_derivados(grafo)
+
+
+# Função para atualizar a data de referência dos prazos (vencidas / a vencer)
+# Só altera a entrada quando o dia mudou, para não recalcular as durações a cada leitura
+# Retorna True se a data mudou
+def atualizar_hoje(grafo, hoje=None):
+    hoje = pd.Timestamp.today().normalize() if hoje is None else hoje
+    if grafo.obter("hoje") == hoje:
+        return False
+    grafo.definir_entrada("hoje", hoje)
+    return True
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+
+# Função para calcular a permutação que ordena uma coluna em ordem crescente
+# Os valores distintos são ordenados uma vez (factorize com sort=True) e as linhas
+# são ordenadas pelos códigos inteiros; valores ausentes ficam no final
+# Retorna a permutação e a quantidade de linhas com valor (as ausentes vêm depois delas)
+def calcular_permutacao(serie):
+    if serie.dtype == object:
+        # Textos em minúsculas para que "abc" e "ABC" fiquem juntos; números e textos misturados viram texto
+        serie = serie.where(serie.isna(), serie.astype(str).str.lower())
+
+    codigos, _ = pd.factorize(serie, sort=True, use_na_sentinel=True)
+    ausentes = codigos < 0
+    codigos = np.where(ausentes, np.iinfo(codigos.dtype).max, codigos)
+
+    permutacao = np.argsort(codigos, kind="stable")
+    return permutacao, int(len(codigos) - ausentes.sum())
+
+
+# Função para aplicar a ordem de uma coluna sobre um subconjunto de linhas (resultado da pesquisa)
+# A ordem decrescente usa a mesma permutação percorrida de trás para frente,
+# mantendo os valores ausentes no final
+def ordenar_linhas(permutacao, total_validos, linhas, crescente=True):
+    if not crescente:
+        permutacao = np.concatenate([permutacao[:total_validos][::-1], permutacao[total_validos:]])
+
+    if linhas is None or len(linhas) == len(permutacao):
+        return permutacao
+
+    selecionadas = np.zeros(len(permutacao), dtype=bool)
+    selecionadas[linhas] = True
+    return permutacao[selecionadas[permutacao]]
@@ -0,0 +1,307 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from tecnicos import contar_tecnicos
+from config_tecnicos import config_padrao, resolver_config, aplicar_em_contagem, aplicar_aliases_em_contagem
+from datas import converter_datas
+
+# Colunas obrigatórias da planilha de tarefas
+COLUNAS_NECESSARIAS = ["ID tarefa", "URL tarefa", "Projeto", "Atividade",
+                       "Data Início", "Data Vencimento", "Técnico"]
+
+COLUNAS_DATA = ["Data Início", "Data Vencimento"]
+
+# Limite padrão de memória (em MB) usado para dimensionar os blocos
+LIMITE_MEMORIA_MB = 256
+
+# Fator de segurança: durante o processamento de um bloco existem cópias temporárias dele
+FATOR_COPIAS = 4
+
+# Quantidade de linhas lidas para estimar o tamanho médio de uma linha
+LINHAS_AMOSTRA = 1000
+
+NOME_MANIFESTO = "manifesto.json"
+
+# Versão do formato dos blocos gravada no manifesto; conversões em outro formato são refeitas
+FORMATO_BLOCOS = 2
+
+# Arquivo de cada bloco com as colunas e os dicionários dos textos
+NOME_COLUNAS_BLOCO = "colunas.json"
+
+
+# Função para montar o dataframe de um bloco a partir das linhas lidas da planilha
+def _montar_bloco(cabecalho, linhas):
+    bloco = pd.DataFrame.from_records(linhas, columns=cabecalho)
+    for col in COLUNAS_DATA:
+        if col in bloco.columns:
+            bloco[col] = converter_datas(bloco[col])
+    return bloco
+
+
+# Função para calcular quantas linhas cabem em um bloco respeitando o limite de memória
+def calcular_linhas_por_bloco(bloco_amostra, limite_memoria_mb=LIMITE_MEMORIA_MB):
+    bytes_por_linha = bloco_amostra.memory_usage(deep=True).sum() / max(len(bloco_amostra), 1)
+    limite_bytes = limite_memoria_mb * 1024 * 1024
+    return max(int(limite_bytes / (bytes_por_linha * FATOR_COPIAS)), LINHAS_AMOSTRA)
+
+
+# Função para converter um valor do dicionário de textos em um tipo aceito pelo JSON
+def _valor_json(valor):
+    if isinstance(valor, np.generic):
+        valor = valor.item()
+    if isinstance(valor, (str, bool, int, float)):
+        return valor
+    return str(valor)
+
+
+# Função para gravar um bloco no disco sem pickle (carregar um pickle pode executar código)
+# Cada coluna vira um arquivo .npy; números e datas são gravados como estão e textos (e demais
+# valores) como códigos inteiros, com os valores distintos no colunas.json do bloco
+def _gravar_bloco(bloco, pasta_bloco):
+    os.makedirs(pasta_bloco, exist_ok=True)
+    colunas = []
+    for i, nome in enumerate(bloco.columns):
+        serie = bloco[nome]
+        coluna = {"nome": nome, "arquivo": f"coluna_{i:02d}.npy"}
+        if isinstance(serie.dtype, np.dtype) and serie.dtype.kind in "biufM":
+            array = serie.to_numpy()
+        else:
+            codigos, valores = pd.factorize(serie, use_na_sentinel=True)
+            array = codigos.astype(np.int32)
+            coluna["dicionario"] = [_valor_json(valor) for valor in valores]
+        np.save(os.path.join(pasta_bloco, coluna["arquivo"]), array, allow_pickle=False)
+        colunas.append(coluna)
+
+    with open(os.path.join(pasta_bloco, NOME_COLUNAS_BLOCO), "w", encoding="utf-8") as arquivo:
+        json.dump(colunas, arquivo, ensure_ascii=False)
+
+
+# Função para ler um bloco gravado por _gravar_bloco (apenas as colunas pedidas)
+def _ler_bloco(pasta_bloco, colunas=None):
+    with open(os.path.join(pasta_bloco, NOME_COLUNAS_BLOCO), encoding="utf-8") as arquivo:
+        descricao = json.load(arquivo)
+
+    dados = {}
+    for coluna in descricao:
+        if colunas is not None and coluna["nome"] not in colunas:
+            continue
+        array = np.load(os.path.join(pasta_bloco, coluna["arquivo"]), allow_pickle=False)
+        if "dicionario" in coluna:
+            # Código -1 (valor ausente) aponta para o NaN acrescentado no final do dicionário
+            valores = np.array(coluna["dicionario"] + [np.nan], dtype=object)
+            array = valores[array]
+        dados[coluna["nome"]] = array
+
+    bloco = pd.DataFrame(dados)
+    return bloco if colunas is None else bloco[colunas]
+
+
+def _ler_manifesto(pasta_blocos):
+    caminho_manifesto = os.path.join(pasta_blocos, NOME_MANIFESTO)
+    if not os.path.exists(caminho_manifesto):
+        return None
+    with open(caminho_manifesto, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+# Função para converter a planilha em blocos colunares no disco (uma única vez)
+# A leitura é feita em modo streaming, então apenas um bloco fica em memória por vez
+def converter_em_blocos(caminho_planilha, pasta_blocos=None, limite_memoria_mb=LIMITE_MEMORIA_MB):
+    if pasta_blocos is None:
+        pasta_blocos = caminho_planilha + ".blocos"
+
+    # Reaproveitar a conversão anterior se a planilha e o limite de memória não mudaram
+    estado_origem = os.stat(caminho_planilha)
+    manifesto = _ler_manifesto(pasta_blocos)
+    if (manifesto is not None
+            and manifesto["tamanho_origem"] == estado_origem.st_size
+            and manifesto["modificacao_origem"] == estado_origem.st_mtime
+            and manifesto.get("limite_memoria_mb") == limite_memoria_mb
+            and manifesto.get("formato") == FORMATO_BLOCOS):
+        return pasta_blocos
+
+    # Apagar a conversão anterior (manifesto primeiro, para não ficar apontando para blocos apagados)
+    if manifesto is not None:
+        os.remove(os.path.join(pasta_blocos, NOME_MANIFESTO))
+        for nome_bloco in manifesto["blocos"]:
+            caminho_bloco = os.path.join(pasta_blocos, nome_bloco)
+            if os.path.isdir(caminho_bloco):
+                shutil.rmtree(caminho_bloco)
+            elif os.path.exists(caminho_bloco):
+                os.remove(caminho_bloco)
+
+    os.makedirs(pasta_blocos, exist_ok=True)
+
+    livro = load_workbook(caminho_planilha, read_only=True, data_only=True)
+    try:
+        planilha = livro.worksheets[0]
+        linhas = planilha.iter_rows(values_only=True)
+
+        cabecalho = [str(valor).strip() if valor is not None else "" for valor in next(linhas, ())]
+        colunas_faltantes = [col for col in COLUNAS_NECESSARIAS if col not in cabecalho]
+        if colunas_faltantes:
+            raise ValueError(f"A planilha não contém as seguintes colunas: {', '.join(colunas_faltantes)}")
+
+        arquivos_blocos = []
+        total_linhas = 0
+        linhas_por_bloco = LINHAS_AMOSTRA
+        pendentes = []
+
+        def gravar_bloco():
+            nonlocal linhas_por_bloco, total_linhas
+            bloco = _montar_bloco(cabecalho, pendentes)[COLUNAS_NECESSARIAS]
+
+            # O primeiro bloco serve de amostra para dimensionar os seguintes
+            if not arquivos_blocos:
+                linhas_por_bloco = calcular_linhas_por_bloco(bloco, limite_memoria_mb)
+
+            nome_bloco = f"bloco_{len(arquivos_blocos):05d}"
+            _gravar_bloco(bloco, os.path.join(pasta_blocos, nome_bloco))
+            arquivos_blocos.append(nome_bloco)
+            total_linhas += len(bloco)
+            pendentes.clear()
+
+        for linha in linhas:
+            # Ignorar linhas completamente vazias
+            if all(valor is None for valor in linha):
+                continue
+            pendentes.append(linha)
+            if len(pendentes) >= linhas_por_bloco:
+                gravar_bloco()
+
+        if pendentes:
+            gravar_bloco()
+    finally:
+        livro.close()
+
+    manifesto = {
+        "origem": os.path.abspath(caminho_planilha),
+        "tamanho_origem": estado_origem.st_size,
+        "modificacao_origem": estado_origem.st_mtime,
+        "limite_memoria_mb": limite_memoria_mb,
+        "formato": FORMATO_BLOCOS,
+        "colunas": COLUNAS_NECESSARIAS,
+        "blocos": arquivos_blocos,
+        "total_linhas": total_linhas,
+        "linhas_por_bloco": linhas_por_bloco,
+    }
+    with open(os.path.join(pasta_blocos, NOME_MANIFESTO), "w", encoding="utf-8") as arquivo:
+        json.dump(manifesto, arquivo, ensure_ascii=False, indent=2)
+
+    return pasta_blocos
+
+
+# Função para percorrer os blocos gravados, um de cada vez
+def iterar_blocos(pasta_blocos, colunas=None):
+    manifesto = _ler_manifesto(pasta_blocos)
+    if manifesto is None:
+        raise FileNotFoundError(f"Nenhum manifesto encontrado em {pasta_blocos}")
+
+    for nome_bloco in manifesto["blocos"]:
+        yield _ler_bloco(os.path.join(pasta_blocos, nome_bloco), colunas)
+
+
+# Agregados parciais de um bloco; todos podem ser somados entre blocos
+def agregados_parciais(bloco):
+    inicio = bloco["Data Início"]
+    vencimento = bloco["Data Vencimento"]
+    duracoes = (vencimento - inicio).dt.days.dropna().astype("int64")
+
+    return {
+        "total_tarefas": len(bloco),
+        "contagem_projetos": bloco["Projeto"].value_counts(),
+        "contagem_tecnicos": contar_tecnicos(bloco["Técnico"]),
+        "contagem_dias": inicio.dt.normalize().value_counts(),
+        # Histograma de durações em dias inteiros: permite média e percentis exatos após a junção
+        "histograma_duracoes": duracoes.value_counts(),
+    }
+
+
+# Função para juntar dois conjuntos de agregados parciais
+def juntar_agregados(a, b):
+    if a is None:
+        return b
+
+    juntos = {"total_tarefas": a["total_tarefas"] + b["total_tarefas"]}
+    for chave in ("contagem_projetos", "contagem_tecnicos", "contagem_dias", "histograma_duracoes"):
+        juntos[chave] = a[chave].add(b[chave], fill_value=0).astype("int64")
+    return juntos
+
+
+# Função para calcular um percentil a partir de um histograma de valores inteiros
+# Interpolação linear entre as posições vizinhas, como no pandas e em duracoes.estatisticas_por_grupo
+def percentil_histograma(histograma, q):
+    if histograma.empty or histograma.sum() == 0:
+        return float("nan")
+    histograma = histograma.sort_index()
+    acumulado = np.cumsum(histograma.to_numpy())
+    valores = histograma.index.to_numpy(dtype=np.float64)
+
+    # Posição (a partir de 0) no vetor ordenado de todas as durações e o valor em cada posição
+    posicao = q * (acumulado[-1] - 1)
+    abaixo = valores[np.searchsorted(acumulado, np.floor(posicao), side="right")]
+    acima = valores[np.searchsorted(acumulado, np.ceil(posicao), side="right")]
+    return float(abaixo + (acima - abaixo) * (posicao - np.floor(posicao)))
+
+
+# Função para transformar os agregados combinados nas métricas do dashboard
+# config/equipe aplicam os apelidos, as exclusões e (com agrupar_squads) os squads à contagem de técnicos;
+# a configuração é resolvida sobre o índice da contagem agregada (um item por técnico)
+def finalizar_agregados(agregados, top_n=10, config=None, equipe=None, agrupar_squads=False):
+    if config is None:
+        config = config_padrao()
+    contagem_tecnicos = aplicar_aliases_em_contagem(agregados["contagem_tecnicos"], config["aliases"])
+    resolucao = resolver_config(config, equipe, contagem_tecnicos.index)
+    contagem_tecnicos = aplicar_em_contagem(contagem_tecnicos, resolucao, agrupar_squads)
+
+    contagem_projetos = agregados["contagem_projetos"].sort_values(ascending=False)
+    contagem_tecnicos = contagem_tecnicos.sort_values(ascending=False, kind="stable")
+    contagem_dias = agregados["contagem_dias"].sort_values(ascending=False)
+    histograma = agregados["histograma_duracoes"]
+
+    total_duracoes = histograma.sum()
+    if total_duracoes > 0:
+        media_dias = round(float((histograma.index.to_numpy() * histograma.to_numpy()).sum() / total_duracoes), 1)
+    else:
+        media_dias = "N/A"
+
+    return {
+        "total_tarefas": int(agregados["total_tarefas"]),
+        "total_projetos": len(contagem_projetos),
+        "top_projetos": contagem_projetos.head(top_n),
+        "top_tecnicos": contagem_tecnicos.head(top_n),
+        "equipe": resolucao["equipe"],
+        "agrupar_squads": agrupar_squads,
+        "dia_mais_tarefas": contagem_dias.index[0] if len(contagem_dias) else None,
+        "qtd_tarefas_dia": int(contagem_dias.iloc[0]) if len(contagem_dias) else 0,
+        "media_dias": media_dias,
+        "mediana_dias": percentil_histograma(histograma, 0.5),
+        "p90_dias": percentil_histograma(histograma, 0.9),
+    }
+
+
+# Função para converter (se necessário) e agregar a planilha bloco a bloco
+# Os agregados podem ser finalizados várias vezes (ex.: outra equipe) sem reler os blocos
+def agregar_planilha_em_disco(caminho_planilha, limite_memoria_mb=LIMITE_MEMORIA_MB):
+    pasta_blocos = converter_em_blocos(caminho_planilha, limite_memoria_mb=limite_memoria_mb)
+
+    agregados = None
+    for bloco in iterar_blocos(pasta_blocos):
+        agregados = juntar_agregados(agregados, agregados_parciais(bloco))
+
+    if agregados is None:
+        raise ValueError("A planilha não contém linhas de dados")
+
+    return agregados
+
+
+# Função principal do modo em disco: converte (se necessário) e calcula as métricas bloco a bloco
+def analisar_planilha_em_disco(caminho_planilha, limite_memoria_mb=LIMITE_MEMORIA_MB, top_n=10,
+                               config=None, equipe=None, agrupar_squads=False):
+    agregados = agregar_planilha_em_disco(caminho_planilha, limite_memoria_mb)
+    return finalizar_agregados(agregados, top_n=top_n, config=config, equipe=equipe, agrupar_squads=agrupar_squads)
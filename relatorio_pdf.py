@@ -0,0 +1,224 @@
+import datetime
+import io
+
+from matplotlib.figure import Figure
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet
+
+from carga_tecnicos import desenhar_mapa_carga
+from camada_exibicao import construir_exibicao
+from graficos_categorias import top_n_com_outros, desenhar_barras_verticais, MAX_CATEGORIAS_GRAFICO
+from duracoes import calcular_duracoes, histograma_duracoes, formatar_dias, desenhar_histograma, DIAS_A_VENCER
+from metricas import criar_grafo_tarefas
+from config_tecnicos import aplicar_em_contagem, aplicar_em_carga, aplicar_em_tabela
+
+# Gráficos do relatório; cada um pode ser desenhado em um processo separado
+TIPOS_GRAFICOS = ["projetos", "tecnicos", "carga", "histograma"]
+
+# Tamanho de cada gráfico no PDF (largura, altura)
+TAMANHOS_GRAFICOS = {
+    "projetos": (450, 250),
+    "tecnicos": (450, 250),
+    "carga": (450, 280),
+    "histograma": (450, 200),
+}
+
+# Quantidade de linhas da tabela de dados no final do relatório
+LINHAS_TABELA_PDF = 20
+
+
+# Função para desenhar um gráfico do relatório e devolver a imagem PNG (ou None se não se aplica)
+# Não usa interface gráfica; pode rodar em qualquer processo
+# grafo traz a configuração dos técnicos (exclusões, squads e apelidos); sem ele usa a configuração padrão
+def renderizar_grafico(df, tipo, grafo=None, agrupar_squads=False):
+    if tipo in ("tecnicos", "carga") and "Técnico" not in df.columns:
+        return None
+    if tipo in ("tecnicos", "carga") and grafo is None:
+        grafo = criar_grafo_tarefas(df)
+
+    if tipo == "projetos":
+        fig = Figure(figsize=(8, 4))
+        ax = fig.add_subplot(111)
+        contagem_projetos = top_n_com_outros(df["Projeto"].value_counts(sort=False),
+                                             MAX_CATEGORIAS_GRAFICO, "Outros projetos")
+        desenhar_barras_verticais(ax, contagem_projetos, "Tarefas por Projeto")
+    elif tipo == "tecnicos":
+        fig = Figure(figsize=(8, 4))
+        ax = fig.add_subplot(111)
+        contagem_tecnicos = aplicar_em_contagem(grafo.obter("contagem_tecnicos"),
+                                                grafo.obter("resolucao_tecnicos"), agrupar_squads)
+        if agrupar_squads:
+            desenhar_barras_verticais(ax, contagem_tecnicos, "Tarefas por Squad")
+        else:
+            contagem_tecnicos = top_n_com_outros(contagem_tecnicos, MAX_CATEGORIAS_GRAFICO, "Outros técnicos")
+            desenhar_barras_verticais(ax, contagem_tecnicos, "Tarefas por Técnico")
+    elif tipo == "carga":
+        carga = aplicar_em_carga(grafo.obter("carga"), grafo.obter("resolucao_tecnicos"), agrupar_squads)
+        if carga is None:
+            return None
+        fig = Figure(figsize=(8, 5))
+        ax = fig.add_subplot(111)
+        imagem = desenhar_mapa_carga(ax, carga, fontsize=7)
+        fig.colorbar(imagem, ax=ax, label="Tarefas abertas")
+    elif tipo == "histograma":
+        fig = Figure(figsize=(8, 3.5))
+        ax = fig.add_subplot(111)
+        desenhar_histograma(ax, histograma_duracoes(calcular_duracoes(df)))
+    else:
+        raise ValueError(f"Tipo de gráfico desconhecido: {tipo}")
+
+    fig.tight_layout()
+
+    # Salvar o gráfico como imagem
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png')
+    return buf.getvalue()
+
+
+# Função para adicionar ao PDF um gráfico já desenhado
+def _adicionar_grafico(elementos, imagens, tipo):
+    if imagens.get(tipo) is None:
+        return
+    largura, altura = TAMANHOS_GRAFICOS[tipo]
+    elementos.append(Image(io.BytesIO(imagens[tipo]), width=largura, height=altura))
+    elementos.append(Spacer(1, 20))
+
+
+# Função para gerar o relatório PDF (sem interface gráfica)
+# imagens pode trazer os gráficos já desenhados em outros processos; os que faltarem são desenhados aqui
+# grafo traz a configuração de técnicos do conjunto de dados; sem ele usa a configuração padrão
+def gerar_pdf(df, caminho, imagens=None, grafo=None, agrupar_squads=False):
+    if grafo is None:
+        grafo = criar_grafo_tarefas(df)
+    imagens = dict(imagens or {})
+    for tipo in TIPOS_GRAFICOS:
+        if tipo not in imagens:
+            imagens[tipo] = renderizar_grafico(df, tipo, grafo, agrupar_squads)
+
+    # Criar o documento PDF
+    doc = SimpleDocTemplate(caminho, pagesize=A4)
+    elementos = []
+
+    # Estilos
+    estilos = getSampleStyleSheet()
+    estilo_titulo = estilos["Heading1"]
+    estilo_subtitulo = estilos["Heading2"]
+    estilo_normal = estilos["Normal"]
+
+    # Título
+    elementos.append(Paragraph("Dashboard de Métricas", estilo_titulo))
+    elementos.append(Spacer(1, 20))
+
+    # Seção 1: Métricas Principais
+    elementos.append(Paragraph("Métricas Principais", estilo_subtitulo))
+    elementos.append(Spacer(1, 10))
+
+    # Mesmas métricas da aba de Métricas (com a mesma configuração de técnicos)
+    metricas = grafo.obter("metricas")
+    analise_duracoes = metricas["duracoes"]
+    duracao_geral = analise_duracoes["geral"]
+
+    # Tabela de métricas
+    dados_metricas = [
+        ["Métrica", "Valor"],
+        ["Total de Tarefas", str(metricas["total_tarefas"])],
+        ["Total de Projetos", str(metricas["total_projetos"])],
+        ["Média de Dias por Tarefa", formatar_dias(duracao_geral["Média"])],
+        ["Mediana / P90 / P99 de Dias", f"{formatar_dias(duracao_geral['Mediana'])} / "
+                                        f"{formatar_dias(duracao_geral['P90'])} / {formatar_dias(duracao_geral['P99'])}"],
+        ["Tarefas Vencidas", str(analise_duracoes["vencidas"])],
+        [f"Vencem em até {DIAS_A_VENCER} dias", str(analise_duracoes["a_vencer"])],
+        ["Projeto com Mais Tarefas", f"{metricas['projeto_mais_tarefas']} ({metricas['qtd_tarefas_projeto']} tarefas)"],
+    ]
+
+    if "Técnico" in df.columns:
+        dados_metricas.append(["Técnico com Mais Tarefas", f"{metricas['tecnico_mais_tarefas']} ({metricas['qtd_tarefas_tecnico']} tarefas)"])
+
+    tabela_metricas = Table(dados_metricas, colWidths=[300, 200])
+    tabela_metricas.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (1, 0), 'CENTER'),
+        ('FONTNAME', (0, 0), (1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (1, 0), 12),
+        ('BACKGROUND', (0, 1), (1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+
+    elementos.append(tabela_metricas)
+    elementos.append(Spacer(1, 20))
+
+    # Seção 2: Gráficos (projetos, técnicos e mapa de carga)
+    elementos.append(Paragraph("Gráficos", estilo_subtitulo))
+    elementos.append(Spacer(1, 10))
+
+    for tipo in ("projetos", "tecnicos", "carga"):
+        _adicionar_grafico(elementos, imagens, tipo)
+
+    # Seção 3: Durações
+    elementos.append(Paragraph("Duração das Tarefas", estilo_subtitulo))
+    elementos.append(Spacer(1, 10))
+
+    _adicionar_grafico(elementos, imagens, "histograma")
+
+    # Tabelas de duração por projeto e por técnico (grupos com mais tarefas)
+    for titulo, estatisticas in (("Duração por Projeto (dias)", analise_duracoes["por_projeto"]),
+                                 ("Duração por Técnico (dias)",
+                                  aplicar_em_tabela(analise_duracoes["por_tecnico"], grafo.obter("resolucao_tecnicos")))):
+        elementos.append(Paragraph(titulo, estilos["Heading3"]))
+        elementos.append(Spacer(1, 5))
+
+        dados_duracao = [[estatisticas.index.name, "Tarefas", "Média", "Mediana", "P90", "P99"]]
+        for nome, linha in estatisticas.head(15).iterrows():
+            dados_duracao.append([str(nome), str(int(linha["Tarefas"]))] +
+                                 [formatar_dias(linha[col]) for col in ("Média", "Mediana", "P90", "P99")])
+
+        tabela_duracao = Table(dados_duracao, colWidths=[170, 60, 60, 60, 60, 60])
+        tabela_duracao.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 8),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+        elementos.append(tabela_duracao)
+        elementos.append(Spacer(1, 20))
+
+    # Seção 4: Tabela de Dados
+    elementos.append(Paragraph("Dados das Tarefas", estilo_subtitulo))
+    elementos.append(Spacer(1, 10))
+
+    # Preparar dados para a tabela
+    colunas = ["ID tarefa", "Projeto", "Atividade", "Data Início", "Data Vencimento", "Técnico"]
+    dados_tabela = [colunas]  # Cabeçalho
+
+    # Limitar a 20 linhas para não sobrecarregar o PDF (só essas linhas são formatadas)
+    dados_tabela.extend(construir_exibicao(df.head(LINHAS_TABELA_PDF), colunas).to_numpy().tolist())
+
+    # Criar a tabela
+    tabela_dados = Table(dados_tabela, colWidths=[60, 100, 150, 80, 80, 50])
+    tabela_dados.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+
+    elementos.append(tabela_dados)
+
+    # Adicionar nota de rodapé
+    elementos.append(Spacer(1, 30))
+    elementos.append(Paragraph(f"Relatório gerado em {datetime.datetime.now().strftime('%d/%m/%Y %H:%M:%S')}", estilo_normal))
+
+    # Construir o PDF
+    doc.build(elementos)
+    return caminho
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+# Função para normalizar nomes de técnicos
+def normalizar_nome(nome):
+    if pd.isna(nome) or nome == "":
+        return "Sem Técnico"
+    
+    # Remover espaços extras e converter para minúsculas para padronização
+    nome = nome.strip().lower()
+    
+    # Capitalizar cada palavra para apresentação
+    nome = ' '.join(word.capitalize() for word in nome.split())
+    
+    return nome
+
+# Função para dividir uma combinação de técnicos ("A,B") na lista de nomes normalizados
+def dividir_combinacao(tecnico):
+    tecnico = normalizar_nome(tecnico)
+    
+    # Verificar se o nome contém vírgula (múltiplos técnicos)
+    if "," in tecnico:
+        return [normalizar_nome(nome) for nome in tecnico.split(",")]
+    return [tecnico]
+
+# Função para calcular a expansão da coluna Técnico: a posição (no dataframe) de cada linha
+# expandida e o nome normalizado do técnico dessa linha
+# Cada combinação distinta é dividida uma única vez; as linhas são repetidas com np.repeat
+def _expandir_tecnicos(serie_tecnicos):
+    # Código de cada linha na lista de combinações distintas (-1 para valores ausentes)
+    codigos, combinacoes = pd.factorize(serie_tecnicos, use_na_sentinel=True)
+    listas = [dividir_combinacao(valor) for valor in combinacoes] + [dividir_combinacao(None)]
+    
+    # Nomes de todas as combinações em sequência e a posição inicial de cada combinação
+    tamanhos = np.array([len(nomes) for nomes in listas], dtype=np.int64)
+    inicios = np.cumsum(tamanhos) - tamanhos
+    nomes = np.array([nome for lista in listas for nome in lista], dtype=object)
+    
+    # Repetir cada linha pelo número de técnicos da sua combinação
+    repeticoes = tamanhos[codigos]
+    posicoes = np.repeat(np.arange(len(serie_tecnicos)), repeticoes)
+    
+    # Posição do técnico dentro da combinação para cada linha expandida (0, 1, 2...)
+    ordem = np.arange(len(posicoes)) - np.repeat(np.cumsum(repeticoes) - repeticoes, repeticoes)
+    
+    return posicoes, nomes[inicios[codigos[posicoes]] + ordem]
+
+# Função para dividir nomes compostos separados por vírgula
+def dividir_nomes_tecnicos(df):
+    # Verificar se a coluna Técnico existe
+    if "Técnico" not in df.columns:
+        return df.copy()
+    
+    posicoes, nomes = _expandir_tecnicos(df["Técnico"])
+    df_expandido = df.iloc[posicoes].copy()
+    df_expandido["Técnico"] = nomes
+    
+    return df_expandido
+
+# Função para obter a posição no dataframe de cada linha de dividir_nomes_tecnicos(df)
+# Permite selecionar as linhas expandidas de um subconjunto sem dividir os nomes de novo
+def posicoes_expandidas(df):
+    if "Técnico" not in df.columns:
+        return np.arange(len(df))
+    return _expandir_tecnicos(df["Técnico"])[0]
+
+# Função para contar tarefas por técnico sem expandir as linhas
+# Cada combinação distinta de nomes é dividida uma única vez e recebe o peso da sua contagem
+def contar_tecnicos(serie_tecnicos):
+    contagem_combinacoes = serie_tecnicos.fillna("").value_counts(dropna=False)
+    
+    contagem = {}
+    for combinacao, quantidade in contagem_combinacoes.items():
+        for nome in dividir_combinacao(combinacao):
+            contagem[nome] = contagem.get(nome, 0) + int(quantidade)
+    
+    return pd.Series(contagem, dtype="int64").sort_values(ascending=False)
+
+# Função para trocar apelidos pelo nome padronizado nas linhas expandidas
+# O dicionário de nomes distintos é traduzido uma única vez; as linhas só recebem os códigos
+def aplicar_aliases(df_expandido, aliases):
+    if not aliases or "Técnico" not in df_expandido.columns:
+        return df_expandido
+
+    aliases = {normalizar_nome(apelido): normalizar_nome(nome) for apelido, nome in aliases.items()}
+    codigos, nomes = pd.factorize(df_expandido["Técnico"])
+    nomes_finais = np.array([aliases.get(nome, nome) for nome in nomes], dtype=object)
+
+    df_resultado = df_expandido.copy(deep=False)
+    df_resultado["Técnico"] = nomes_finais[codigos]
+    return df_resultado
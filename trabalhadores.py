@@ -0,0 +1,114 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from memoria_compartilhada import anexar_tabela
+from relatorio_pdf import gerar_pdf, renderizar_grafico, TIPOS_GRAFICOS
+from metricas import criar_grafo_tarefas, atualizar_hoje
+
+# Quantidade máxima de processos de exportação/renderização
+MAX_TRABALHADORES = max(1, min(4, os.cpu_count() or 1))
+
+_pool_processos = None
+_pool_threads = None
+
+# Em cada processo: tabelas já anexadas (nome do bloco -> (bloco, dataframe))
+_tabelas_anexadas = {}
+
+# Em cada processo: grafo de derivados da tabela anexada (nome do bloco -> grafo)
+_grafos = {}
+
+
+# Função para obter o pool de processos (criado uma vez e reaproveitado entre exportações)
+def obter_pool():
+    global _pool_processos
+    if _pool_processos is None:
+        # "spawn" evita copiar o processo da interface (Tk) para os processos
+        contexto = multiprocessing.get_context("spawn")
+        _pool_processos = ProcessPoolExecutor(max_workers=MAX_TRABALHADORES, mp_context=contexto)
+    return _pool_processos
+
+
+# Função para encerrar os pools ao fechar o aplicativo
+def encerrar_pools():
+    global _pool_processos, _pool_threads
+    if _pool_processos is not None:
+        _pool_processos.shutdown(wait=False, cancel_futures=True)
+        _pool_processos = None
+    if _pool_threads is not None:
+        _pool_threads.shutdown(wait=False, cancel_futures=True)
+        _pool_threads = None
+
+
+# Função para rodar uma função bloqueante fora da thread da interface; retorna um Future
+def executar_em_segundo_plano(funcao, *args):
+    global _pool_threads
+    if _pool_threads is None:
+        _pool_threads = ThreadPoolExecutor(max_workers=2)
+    return _pool_threads.submit(funcao, *args)
+
+
+# Função executada nos processos: anexa a tabela compartilhada uma única vez por processo
+# Só a tabela mais recente fica anexada; as anteriores são fechadas
+def tabela_anexada(descritor):
+    nome = descritor["nome"]
+    if nome not in _tabelas_anexadas:
+        # Descartar os dataframes antes de fechar os blocos (as colunas são vistas sobre eles)
+        blocos_antigos = [shm for shm, _ in _tabelas_anexadas.values()]
+        _tabelas_anexadas.clear()
+        _grafos.clear()
+        for shm in blocos_antigos:
+            shm.close()
+        df, shm = anexar_tabela(descritor)
+        _tabelas_anexadas[nome] = (shm, df)
+    return _tabelas_anexadas[nome][1]
+
+
+# Função executada nos processos: grafo de derivados da tabela anexada com a configuração de técnicos
+# O grafo é mantido entre tarefas; uma nova configuração só recalcula o que depende dela
+def grafo_anexado(descritor, opcoes):
+    df = tabela_anexada(descritor)
+    nome = descritor["nome"]
+    if nome not in _grafos:
+        _grafos[nome] = criar_grafo_tarefas(df, opcoes["config"], opcoes["equipe"])
+    grafo = _grafos[nome]
+    if grafo.obter("config") != opcoes["config"]:
+        grafo.definir_entrada("config", opcoes["config"])
+    if grafo.obter("aliases") != opcoes["config"]["aliases"]:
+        grafo.definir_entrada("aliases", dict(opcoes["config"]["aliases"]))
+    if grafo.obter("equipe") != opcoes["equipe"]:
+        grafo.definir_entrada("equipe", opcoes["equipe"])
+    # O processo pode ter sido criado em outro dia
+    atualizar_hoje(grafo)
+    return df, grafo
+
+
+def tarefa_grafico(descritor, tipo, opcoes):
+    df, grafo = grafo_anexado(descritor, opcoes)
+    return renderizar_grafico(df, tipo, grafo, opcoes["agrupar_squads"])
+
+
+def tarefa_pdf(descritor, caminho, imagens, opcoes):
+    df, grafo = grafo_anexado(descritor, opcoes)
+    return gerar_pdf(df, caminho, imagens, grafo, opcoes["agrupar_squads"])
+
+
+def tarefa_excel(descritor, caminho, colunas):
+    df = tabela_anexada(descritor)
+    df[[col for col in colunas if col in df.columns]].to_excel(caminho, index=False)
+    return caminho
+
+
+# Função para gerar o PDF nos processos: cada gráfico é desenhado em um processo
+# e o documento é montado em seguida; só o descritor da tabela e as opções de técnicos
+# (ConjuntoDados.opcoes_tecnicos) são enviados
+def exportar_pdf_em_trabalhadores(descritor, caminho, opcoes):
+    pool = obter_pool()
+    futuros = {tipo: pool.submit(tarefa_grafico, descritor, tipo, opcoes) for tipo in TIPOS_GRAFICOS}
+    imagens = {tipo: futuro.result() for tipo, futuro in futuros.items()}
+    return pool.submit(tarefa_pdf, descritor, caminho, imagens, opcoes).result()
+
+
+# Função para gerar a planilha Excel em um processo a partir da tabela compartilhada
+def exportar_excel_em_trabalhadores(descritor, caminho, colunas):
+    return obter_pool().submit(tarefa_excel, descritor, caminho, colunas).result()
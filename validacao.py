@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+
+from datas import converter_datas
+
+
+# Função para avaliar uma verificação apenas nos valores distintos da coluna
+# e propagar o resultado para todas as linhas através dos códigos do factorize
+def avaliar_por_valores_unicos(serie, verificacao):
+    codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+
+    # Código -1 indica valor ausente; acrescentamos um NaN no fim para que codigos[-1] aponte para ele
+    valores = pd.Series(np.append(np.asarray(unicos, dtype=object), np.nan), dtype=object)
+    resultado_unicos = np.asarray(verificacao(valores), dtype=bool)
+    return resultado_unicos[codigos]
+
+
+# Função para converter uma coluna de datas sem falhar em valores inválidos
+def _coluna_data(df, coluna):
+    if coluna not in df.columns:
+        return pd.Series(pd.NaT, index=df.index)
+    return converter_datas(df[coluna])
+
+
+def _texto_vazio(valores):
+    return valores.isna() | (valores.astype(str).str.strip() == "")
+
+
+# Caracteres de espaço que invalidam uma URL (após remover os das pontas)
+ESPACOS_URL = (" ", "\t", "\n", "\r", "\x0b", "\x0c", "\xa0")
+
+
+# URL válida: protocolo opcional (http:// ou https://), domínio com um ponto que não está
+# no início nem no fim do domínio e nenhum espaço; URLs vazias ou em branco não são malformadas
+# Usa verificações vetorizadas do numpy em vez de uma expressão regular por linha; funciona
+# também com colunas inteiramente vazias, que o read_excel carrega como float
+def _url_malformada(valores):
+    texto = valores.fillna("").to_numpy(dtype=str)
+    texto = np.strings.strip(texto)
+    vazia = texto == ""
+
+    https = np.strings.startswith(texto, "https://")
+    http = np.strings.startswith(texto, "http://")
+    inicio = np.where(https, 8, np.where(http, 7, 0))
+    barra = np.strings.find(texto, "/", inicio)
+    fim_dominio = np.where(barra >= 0, barra, np.strings.str_len(texto))
+    ponto = np.strings.find(texto, ".", inicio + 1)
+    dominio_ok = (ponto >= 0) & (ponto + 1 < fim_dominio)
+
+    sem_espacos = np.ones(len(texto), dtype=bool)
+    for espaco in ESPACOS_URL:
+        sem_espacos &= np.strings.find(texto, espaco) < 0
+    return ~vazia & ~(dominio_ok & sem_espacos)
+
+
+# Regras de validação: cada uma recebe o dataframe e devolve uma máscara booleana (numpy)
+def regra_vencimento_antes_inicio(df):
+    inicio = _coluna_data(df, "Data Início")
+    vencimento = _coluna_data(df, "Data Vencimento")
+    return (vencimento < inicio).to_numpy()
+
+
+def regra_data_inicio_ausente(df):
+    return _coluna_data(df, "Data Início").isna().to_numpy()
+
+
+def regra_data_vencimento_ausente(df):
+    return _coluna_data(df, "Data Vencimento").isna().to_numpy()
+
+
+def regra_id_duplicado(df):
+    if "ID tarefa" not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    ids = df["ID tarefa"]
+    return (ids.duplicated(keep=False) & ids.notna()).to_numpy()
+
+
+def regra_tecnico_vazio(df):
+    if "Técnico" not in df.columns:
+        return np.ones(len(df), dtype=bool)
+    return avaliar_por_valores_unicos(df["Técnico"], _texto_vazio)
+
+
+def regra_url_malformada(df):
+    if "URL tarefa" not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    serie = df["URL tarefa"]
+    # Coluna categórica (tabela compartilhada): basta verificar as categorias
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return avaliar_por_valores_unicos(serie, _url_malformada)
+    # URLs costumam ser únicas por linha, então a verificação é feita direto na coluna
+    return _url_malformada(serie)
+
+
+# Lista ordenada de regras exibidas no card "Erros" e no detalhamento
+REGRAS_VALIDACAO = [
+    ("Vencimento antes do início", regra_vencimento_antes_inicio),
+    ("Data Início ausente", regra_data_inicio_ausente),
+    ("Data Vencimento ausente", regra_data_vencimento_ausente),
+    ("ID tarefa duplicado", regra_id_duplicado),
+    ("Técnico vazio", regra_tecnico_vazio),
+    ("URL malformada", regra_url_malformada),
+]
+
+
+# Função para avaliar todas as regras de uma vez sobre o dataframe
+# Retorna um dicionário com a contagem por regra, a matriz de máscaras e o total de linhas com erro
+def avaliar_regras(df, regras=None):
+    regras = REGRAS_VALIDACAO if regras is None else regras
+    nomes = [nome for nome, _ in regras]
+
+    # Matriz (linhas x regras) com uma coluna por máscara
+    mascaras = np.zeros((len(df), len(regras)), dtype=bool)
+    for i, (_, regra) in enumerate(regras):
+        mascaras[:, i] = regra(df)
+
+    contagens = dict(zip(nomes, mascaras.sum(axis=0).tolist()))
+    linhas_com_erro = mascaras.any(axis=1)
+
+    return {
+        "regras": nomes,
+        "contagens": contagens,
+        "mascaras": mascaras,
+        "linhas_com_erro": linhas_com_erro,
+        "total_linhas_com_erro": int(linhas_com_erro.sum()),
+        "total_ocorrencias": int(mascaras.sum()),
+    }
+
+
+# Função para montar a lista de linhas com problema, com uma coluna descrevendo os erros
+# limite restringe às primeiras linhas com erro (usado na janela de detalhes)
+def linhas_com_erros(df, resultado, limite=None):
+    posicoes = np.flatnonzero(resultado["linhas_com_erro"])
+    if limite is not None:
+        posicoes = posicoes[:limite]
+    df_erros = df.iloc[posicoes].copy()
+
+    # Concatenar os nomes das regras violadas apenas nas linhas com erro
+    mascaras = resultado["mascaras"][posicoes]
+    descricao = np.full(len(posicoes), "", dtype=object)
+    for i, nome in enumerate(resultado["regras"]):
+        separador = np.where(descricao == "", "", "; ")
+        descricao = np.where(mascaras[:, i], descricao + separador + nome, descricao)
+
+    df_erros.insert(0, "Erros", descricao)
+    return df_erros